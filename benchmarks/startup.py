@@ -0,0 +1,61 @@
+"""
+Measures cold start time of the program.
+
+Launches a fresh interpreter for every run, so the numbers include interpreter startup, module imports and building
+the starting Board, which is what batch wrappers launching the program many times pay.
+
+Usage:
+    python benchmarks/startup.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPOSITORY_PATH: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, command run from the repository root, stdin fed to it)
+CASES: list[tuple[str, list[str], bytes]] = [
+    ("interpreter", [sys.executable, "-c", "pass"], b""),
+    ("import board", [sys.executable, "-c", "import board"], b""),
+    ("main.py -c", [sys.executable, "main.py", "-c"], b"exit\n"),
+]
+
+
+def time_command(command: list[str], stdin: bytes, runs: int) -> list[float]:
+    """Runs command runs times and returns the wall time of every run in seconds."""
+
+    timings: list[float] = []
+    for _ in range(runs):
+        start: float = time.perf_counter()
+        subprocess.run(command, input=stdin, cwd=REPOSITORY_PATH, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def imports_pygame(command: list[str], stdin: bytes) -> bool:
+    """Returns True if running command imports pygame."""
+
+    probe: list[str] = [sys.executable, "-X", "importtime", *command[1:]]
+    result = subprocess.run(probe, input=stdin, cwd=REPOSITORY_PATH, capture_output=True)
+    return b"pygame" in result.stderr
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="startup.py")
+    parser.add_argument("--runs", type=int, default=20)
+    runs: int = parser.parse_args().runs
+
+    print(f"{'case':<16}{'min (ms)':>10}{'median (ms)':>13}{'pygame':>8}")
+    for name, command, stdin in CASES:
+        timings: list[float] = time_command(command, stdin, runs)
+        print(
+            f"{name:<16}{min(timings) * 1000:>10.1f}{statistics.median(timings) * 1000:>13.1f}"
+            f"{'yes' if imports_pygame(command, stdin) else 'no':>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Micro benchmarks of every subsystem, compared against a stored baseline.
+
+Every case is timed with timeit in runs whose number of calls is calibrated to take about RUN_SECONDS, the runs of
+all cases are interleaved, the median of the runs is kept, and the time per call is written as JSON. When a baseline
+exists, every case slower than the baseline by more than the threshold is reported and the exit code is 1, so the
+suite can guard performance work in CI. The GUI frame is drawn with SDL's dummy video driver, so no display is needed.
+
+The baseline is specific to the machine and Python version it was recorded on, which are stored in it. A fixed pure
+Python reference case is timed with the others and the cases are compared relative to it, which absorbs the machine
+running faster or slower than when the baseline was recorded, but not a different CPU or Python version. Record the
+baseline with --save-baseline on the machine the suite runs on, and again after any change meant to alter the timings.
+
+Usage:
+    python benchmarks/suite.py [--output results.json] [--baseline benchmarks/baseline.json] [--threshold 15]
+    python benchmarks/suite.py --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from typing import Any, Callable
+
+REPOSITORY_PATH: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH: str = os.path.join(REPOSITORY_PATH, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD: float = 15.0
+DEFAULT_REPEAT: int = 31
+REFERENCE_CASE: str = "reference"
+# Seconds taken by one run of a case, long enough for the timer resolution and short scheduler pauses not to matter.
+RUN_SECONDS: float = 0.04
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, REPOSITORY_PATH)
+# The GUI loads its assets with paths relative to the repository root.
+os.chdir(REPOSITORY_PATH)
+
+import constants as const
+from board import Board
+from positions import MovementTuple
+import fen
+import inputs
+
+# Italian game, every piece type has moves and Bxf7 gives check.
+MIDDLEGAME_FEN: str = "r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQK2R w KQkq - 1 5"
+CHECKING_MOVE: str = "c4 f7"
+
+
+def reference_case() -> list[str]:
+    """Fixed work which does not depend on the repository, its time tracks the speed of the machine."""
+
+    squares: dict[int, str] = {}
+    for index in range(256):
+        squares[index] = str(index * 7 % 64)
+    return sorted(squares.values())
+
+
+def board_cases() -> dict[str, Callable[[], Any]]:
+    """Returns the cases which only need the Board, keyed by name."""
+
+    board = Board(MIDDLEGAME_FEN)
+    cases: dict[str, Callable[[], Any]] = {
+        "fen.fen_parser": lambda: fen.fen_parser(MIDDLEGAME_FEN),
+        "Board()": lambda: Board(MIDDLEGAME_FEN),
+        "inputs.input_str_to_movement_tuple": lambda: inputs.input_str_to_movement_tuple(CHECKING_MOVE),
+    }
+
+    for name in [const.PAWN, const.KNIGHT, const.BISHOP, const.ROOK, const.QUEEN, const.KING]:
+        piece = next(
+            piece for row in board.grid.array for piece in row
+            if piece.color == const.WHITE and piece.name == name and board.get_legal_moves(piece)
+        )
+        cases[f"get_legal_moves {name}"] = lambda piece=piece: board.get_legal_moves(piece)
+
+    movement: MovementTuple = inputs.input_str_to_movement_tuple(CHECKING_MOVE)
+
+    def move_and_unmake() -> None:
+        board.move(movement)
+        board.unmake_move()
+
+    cases["Board.move giving check + unmake_move"] = move_and_unmake
+    return cases
+
+
+def gui_cases() -> dict[str, Callable[[], Any]]:
+    """Returns the headless GUI frame case, or no case if pygame is not installed."""
+
+    try:
+        import pygame
+        import gui
+    except ImportError:
+        return {}
+
+    pygame.init()
+    screen: pygame.Surface = pygame.display.set_mode((const.BOARD_WIDTH, const.BOARD_HEIGHT))
+    chess_board: pygame.Surface = pygame.image.load("assets/chess_board.png")
+    highlight: pygame.Surface = pygame.Surface((const.GRID_BOX_SIZE, const.GRID_BOX_SIZE), pygame.SRCALPHA)
+    highlight.fill(const.HIGHLIGHT_COLOR)
+    board = Board(MIDDLEGAME_FEN)
+    all_sprites = gui.AllSprites(board)
+    highlighted_squares: set[tuple[int, int]] = max(board.get_legal_move_index().values(), key=len)
+
+    return {
+        "gui frame": lambda: gui.draw_frame(screen, chess_board, chess_board.get_rect(), all_sprites, highlight, highlighted_squares)
+    }
+
+
+def time_cases(cases: dict[str, Callable[[], Any]], repeat: int) -> dict[str, float]:
+    """
+    Returns the time of one call of every case in microseconds, over repeat rounds of runs of about RUN_SECONDS each.
+
+    Every round runs each case once. The time of a case is the median over the rounds of its time relative to the
+    reference case in the same round, times the median time of the reference case, so a change in the speed of the
+    machine during the suite is cancelled out.
+    """
+    timers: dict[str, tuple[timeit.Timer, int]] = {}
+    for name, function in cases.items():
+        timer = timeit.Timer(function)
+        # autorange also warms the case up before it is timed.
+        number, elapsed = timer.autorange()
+        timers[name] = (timer, max(1, round(number * RUN_SECONDS / elapsed)))
+
+    times: dict[str, list[float]] = {name: [] for name in cases}
+    for _ in range(repeat):
+        for name, (timer, number) in timers.items():
+            times[name].append(timer.timeit(number) / number * 1e6)
+
+    reference_times: list[float] = times[REFERENCE_CASE]
+    reference_time: float = statistics.median(reference_times)
+    return {
+        name: statistics.median(case_time / round_reference for case_time, round_reference in zip(case_times, reference_times)) * reference_time
+        for name, case_times in times.items()
+    }
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    Prints every case next to its baseline and returns the names of the cases slower by more than threshold percent.
+
+    The change of every case is measured after scaling it by how much the reference case changed.
+    """
+    speed: float = 1.0
+    if REFERENCE_CASE in results and REFERENCE_CASE in baseline:
+        speed = results[REFERENCE_CASE] / baseline[REFERENCE_CASE]
+        print(f"The reference case takes {speed:.2f}x its baseline time, every change below is relative to it.")
+
+    regressions: list[str] = []
+    print(f"{'case':<40}{'us/call':>12}{'baseline':>12}{'change':>10}")
+    for name, value in results.items():
+        if name == REFERENCE_CASE:
+            continue
+        if name not in baseline:
+            print(f"{name:<40}{value:>12.2f}{'-':>12}{'-':>10}")
+            continue
+        change: float = (value / speed - baseline[name]) / baseline[name] * 100
+        flag: str = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<40}{value:>12.2f}{baseline[name]:>12.2f}{change:>+9.1f}%{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+class Args:
+    def __init__(self) -> None:
+        self.output: str | None
+        self.baseline: str
+        self.threshold: float
+        self.repeat: int
+        self.save_baseline: bool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="suite.py")
+    args = Args()
+    parser.add_argument("-o", "--output", default=None, help="Writes the results as JSON to this file.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Percent slowdown reported as a regression.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Number of timed runs of every case.")
+    parser.add_argument("--save-baseline", action="store_true", help="Writes the results as the new baseline.")
+    parser.parse_args(namespace=args)
+
+    cases: dict[str, Callable[[], Any]] = {REFERENCE_CASE: reference_case, **board_cases(), **gui_cases()}
+    results: dict[str, float] = time_cases(cases, args.repeat)
+    report: dict[str, Any] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "unit": "us/call",
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    baseline: dict[str, float] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+    regressions: list[str] = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} cases regressed by more than {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,19 @@
-from typing import Any
+from typing import Any, Iterator
 
 import constants as const
 from positions import PositionTuple, MovementTuple
-from pieces import Piece, King, Pawn, Empty, create_piece
+from pieces import Piece, King, Knight, Pawn, Empty, create_piece, piece_classes
+from inputs import position_tuple_to_alg_notation
 import errors
 import fen
+import zobrist
 
 
+# Compact state of a Board: (squares, active_color, castling, en_passant_squares, halfmove_count, fullmove_count, moved_mask, hash)
+# where squares holds the notation of all 64 squares ("E" when empty), rank by rank from the top, castling is four
+# 0s and 1s in the order of CASTLING_SIDES and bit (rank * GRID_SIZE + file) of moved_mask is the is_moved of that piece.
+PackedBoard = tuple[str, int, str, str, int, int, int, int]
+
 
 class Board:
     """
@@ -19,14 +26,19 @@ class Board:
         grid: A Grid object representing the state of the board.
         active_color: The color whose turn is right now.
         castling_availability: A dictionary of bools for all four possible castles.
-        en_passant_squares: A string containing all the squares on which a pawn can move to make an en passant capture.
-        halfmove_count: The number of halfmoves.
+        en_passant_squares: The square skipped by a Pawn which just moved two squares, '-' after any other move.
+        halfmove_count: The number of halfmoves since the last capture or Pawn move.
         fullmove_count: The number of fullmoves.
         captured_pieces: List of captured pieces.
+        move_history: Stack of (movement, captured piece, moved piece as it was before the move, halfmove_count, hash, pawn_hash, en_passant_squares) used to unmake moves.
+        hash: Zobrist hash of the position, updated incrementally by make_move and unmake_move.
+        pawn_hash: Zobrist hash of the Pawns only, it changes only when a Pawn moves or is captured.
+        position_history: Stack of the hashes of every position reached, the current one last.
+        piece_count: Number of pieces on the board for every (color, name), updated on captures.
     """
     def __init__(self, fen_string: str) -> None:
         FEN_data: dict[str, Any] | None = fen.fen_parser(fen_string)
-        if not FEN_data:
+        if not FEN_data or not fen.has_one_king_per_color(FEN_data):
             raise errors.InvalidFEN
         
         self.active_color: int = FEN_data["active_color"]
@@ -36,32 +48,202 @@ class Board:
 
         self.grid = Grid(FEN_data["piece_placement_data"])
 
-        self.castling_availability: dict[str, bool] = {
-            const.symbol_notation_and_material[const.NOTATION][const.WHITE][const.QUEEN]: False,
-            const.symbol_notation_and_material[const.NOTATION][const.BLACK][const.KING]: False,
-            const.symbol_notation_and_material[const.NOTATION][const.WHITE][const.KING]: False,
-            const.symbol_notation_and_material[const.NOTATION][const.BLACK][const.QUEEN]: False
-        }
+        self.castling_availability: dict[str, bool] = {side: False for side in const.CASTLING_SIDES}
 
         for castling, castling_availability in zip(list(self.castling_availability.keys()), FEN_data["castling_availability"]):
             if int(castling_availability) == 1:
                 self.castling_availability[castling] = True
         
         self.captured_pieces: list[Piece] = []
+        self.move_history: list[tuple[MovementTuple, Piece, Piece, int, int, int, str]] = []
+
+        self.piece_count: dict[tuple[int, str], int] = self.count_pieces()
+
+        self.hash: int = self.compute_hash()
+        self.pawn_hash: int = self.compute_pawn_hash()
+        self.position_history: list[int] = [self.hash]
+
+
+    def pack(self) -> PackedBoard:
+        """Returns the compact, immutable state of the board, see PackedBoard."""
+
+        notations: list[dict[str, str]] = const.symbol_notation_and_material[const.NOTATION]
+        squares: list[str] = []
+        moved_mask: int = 0
+        for index, piece in enumerate(piece for row in self.grid.array for piece in row):
+            squares.append(notations[piece.color][piece.name])
+            if piece.is_moved:
+                moved_mask |= 1 << index
+
+        return (
+            "".join(squares),
+            self.active_color,
+            "".join("1" if self.castling_availability[side] else "0" for side in const.CASTLING_SIDES),
+            self.en_passant_squares,
+            self.halfmove_count,
+            self.fullmove_count,
+            moved_mask,
+            self.hash
+        )
+
+
+    @classmethod
+    def from_packed(cls, packed: PackedBoard, position_history: list[int] | None = None) -> "Board":
+        """
+        Creates a Board from the state returned by pack, without parsing a FEN string.
+
+        Args:
+            packed: State returned by pack.
+            position_history: Hashes of the positions before this one, copied so repetitions are still detected.
+        """
+        board: Board = cls.__new__(cls)
+        (
+            squares,
+            board.active_color,
+            castling,
+            board.en_passant_squares,
+            board.halfmove_count,
+            board.fullmove_count,
+            moved_mask,
+            board.hash
+        ) = packed
+
+        board.grid = Grid([squares[index:index + const.GRID_SIZE] for index in range(0, len(squares), const.GRID_SIZE)]) #type: ignore
+        if moved_mask:
+            for index, piece in enumerate(piece for row in board.grid.array for piece in row):
+                # Empty squares are shared by every Board and never change.
+                if not isinstance(piece, Empty):
+                    piece.is_moved = bool(moved_mask >> index & 1)
+
+        board.castling_availability = {side: flag == "1" for side, flag in zip(const.CASTLING_SIDES, castling)}
+        board.captured_pieces = []
+        board.move_history = []
+        board.piece_count = board.count_pieces()
+        board.pawn_hash = board.compute_pawn_hash()
+        board.position_history = list(position_history) if position_history else [board.hash]
+        return board
+
+
+    def copy(self) -> "Board":
+        """
+        Returns an independent Board in the same position.
+
+        Pieces are never modified in place by make_move, which writes a new Piece instead, so the copy shares every
+        Piece with this board except the Kings, whose is_under_Check is updated in place. Only the ranks, the Kings and
+        the counters are copied.
+        """
+        board: Board = Board.__new__(Board)
+        board.active_color = self.active_color
+        board.en_passant_squares = self.en_passant_squares
+        board.halfmove_count = self.halfmove_count
+        board.fullmove_count = self.fullmove_count
+        board.castling_availability = self.castling_availability.copy()
+        board.captured_pieces = self.captured_pieces.copy()
+        board.move_history = []
+        board.piece_count = self.piece_count.copy()
+        board.hash = self.hash
+        board.pawn_hash = self.pawn_hash
+        board.position_history = self.position_history.copy()
+
+        board.grid = Grid.__new__(Grid)
+        board.grid.array = [row.copy() for row in self.grid.array]
+        board.grid.king_position = self.grid.king_position.copy()
+        for king_position in board.grid.king_position.values():
+            board.grid[king_position] = board.grid[king_position].moved_to(king_position)
+            board.grid[king_position].is_moved = self.grid[king_position].is_moved
+        return board
+
+
+    def count_pieces(self) -> dict[tuple[int, str], int]:
+        """Returns the number of pieces on the board for every (color, name)."""
+
+        piece_count: dict[tuple[int, str], int] = {}
+        for row in self.grid.array:
+            for piece in row:
+                if piece.color != const.EMPTY:
+                    piece_count[(piece.color, piece.name)] = piece_count.get((piece.color, piece.name), 0) + 1
+        return piece_count
+
+
+    def compute_hash(self) -> int:
+        """Returns the Zobrist hash of the position computed from scratch."""
+
+        position_hash: int = zobrist.black_to_move_key if self.active_color == const.BLACK else 0
+        for row in self.grid.array:
+            for piece in row:
+                if piece.color != const.EMPTY:
+                    position_hash ^= zobrist.piece_key(piece.color, piece.name, piece.position.rank, piece.position.file)
+        for castling, is_available in self.castling_availability.items():
+            if is_available:
+                position_hash ^= zobrist.castling_keys[castling]
+        return position_hash
+
+
+    def compute_pawn_hash(self) -> int:
+        """Returns the Zobrist hash of the Pawns computed from scratch."""
+
+        pawn_hash: int = 0
+        for row in self.grid.array:
+            for piece in row:
+                if isinstance(piece, Pawn):
+                    pawn_hash ^= zobrist.piece_key(piece.color, piece.name, piece.position.rank, piece.position.file)
+        return pawn_hash
     
         
     def display(self) -> None:
         """Prints the Chess Board in a Visually Good manner."""
 
-        print(f"{const.DIM}┌───┬───┬───┬───┬───┬───┬───┬───┬───┐{const.RESET}")
+        print(self.render())
+
+
+    def render(self) -> str:
+        """Returns what display prints as one string, so the whole board can be written at once."""
+
+        lines: list[str] = [f"{const.DIM}┌───┬───┬───┬───┬───┬───┬───┬───┬───┐{const.RESET}"]
+        separator: str = f"{const.DIM} │ {const.RESET}"
+        for rank in range(const.GRID_SIZE):
+            cells: str = "".join(
+                f"{const.BOLD}{self.grid.array[rank][file].symbol}{const.RESET}{separator}" for file in range(const.GRID_SIZE)
+            )
+            lines.append(f"{const.DIM}│ {const.GRID_SIZE - rank} │ {const.RESET}{cells}")
+            lines.append(f"{const.DIM}├───┼───┼───┼───┼───┼───┼───┼───┼───┤{const.RESET}")
+        lines.append(f"{const.DIM}│   │ A │ B │ C │ D │ E │ F │ G │ H │{const.RESET}")
+        lines.append(f"{const.DIM}└───┴───┴───┴───┴───┴───┴───┴───┴───┘{const.RESET}")
+        return "\n".join(lines)
+
+
+    def to_fen(self) -> str:
+        """Returns the FEN string describing the current state of the board."""
+
+        ranks: list[str] = []
         for rank in range(const.GRID_SIZE):
-            print(f"{const.DIM}│ {const.GRID_SIZE - rank} │ {const.RESET}", end="")
+            rank_str: str = ""
+            empty_count: int = 0
             for file in range(const.GRID_SIZE):
-                print(f"{const.BOLD}{self.grid.array[rank][file].symbol}{const.RESET}", end = f"{const.DIM} │ {const.RESET}")
-            print()
-            print(f"{const.DIM}├───┼───┼───┼───┼───┼───┼───┼───┼───┤{const.RESET}")
-        print(f"{const.DIM}│   │ A │ B │ C │ D │ E │ F │ G │ H │{const.RESET}")
-        print(f"{const.DIM}└───┴───┴───┴───┴───┴───┴───┴───┴───┘{const.RESET}")
+                piece: Piece = self.grid.array[rank][file]
+                if piece.color == const.EMPTY:
+                    empty_count += 1
+                    continue
+                if empty_count:
+                    rank_str += str(empty_count)
+                    empty_count = 0
+                rank_str += const.symbol_notation_and_material[const.NOTATION][piece.color][piece.name]
+            if empty_count:
+                rank_str += str(empty_count)
+            ranks.append(rank_str)
+
+        castling_str: str = "".join(
+            castling for castling, is_available in self.castling_availability.items() if is_available
+        )
+
+        return " ".join([
+            "/".join(ranks),
+            "w" if self.active_color == const.WHITE else "b",
+            castling_str or "-",
+            self.en_passant_squares,
+            str(self.halfmove_count),
+            str(self.fullmove_count)
+        ])
 
 
     def get_legal_moves(self, piece: Piece) -> list[PositionTuple]:
@@ -83,12 +265,12 @@ class Board:
         
         elif isinstance(piece, Pawn):
             values: list[PositionTuple] = piece.values_to_calculate_possible_moves
-            upper_bound: int = len(values) - 1 if piece.is_moved else len(values)
+            upper_bound: int = len(values) if position.rank == Pawn.starting_rank[piece.color] else len(values) - 1
             for value in values[:upper_bound]:
                 move: PositionTuple = position + value
-                if not move.is_out_of_bounds():
-                    if self.grid[move].color == const.EMPTY:
-                        legal_moves.append(move)
+                if move.is_out_of_bounds() or self.grid[move].color != const.EMPTY:
+                    break
+                legal_moves.append(move)
             values = piece.values_to_calculate_possible_captures
             for value in values:
                 move: PositionTuple = position + value
@@ -109,6 +291,75 @@ class Board:
         return legal_moves
 
 
+    def get_captures(self, piece: Piece) -> list[PositionTuple]:
+        """Returns only the squares from get_legal_moves on which the piece captures an opponent's piece."""
+
+        captures: list[PositionTuple] = []
+        position: PositionTuple = piece.position
+        opponent_color: int = (piece.color + 1) % 2
+
+        if piece.can_slide:
+            for direction in piece.directions_to_get_possible_moves:
+                move: PositionTuple = position.get_relative_position(direction)
+                while not move.is_out_of_bounds():
+                    if self.grid[move].color != const.EMPTY:
+                        if self.grid[move].color == opponent_color:
+                            captures.append(move)
+                        break
+                    move = move.get_relative_position(direction)
+        else:
+            values: list[PositionTuple] = piece.values_to_calculate_possible_captures if isinstance(piece, Pawn) else piece.values_to_calculate_possible_moves
+            for value in values:
+                move: PositionTuple = position + value
+                if not move.is_out_of_bounds() and self.grid[move].color == opponent_color:
+                    captures.append(move)
+
+        return captures
+
+
+    def generate_moves(self, hash_move: MovementTuple | None = None, captures_only: bool = False) -> Iterator[MovementTuple]:
+        """
+        Yields every move of the active color in stages, generating each stage only once the previous one is used up.
+
+        The stages are the hash_move (if it is a move of the active color), captures ordered by MVV-LVA (most valuable
+        victim first, then least valuable attacker) and finally quiet moves. Like get_legal_moves, the moves may leave
+        the own King under Check, so a search should test is_king_under_Check for the moving color after make_move,
+        and it must unmake that move before asking for the next one.
+
+        Args:
+            hash_move: Best move found earlier for this position, e.g. from a transposition table.
+            captures_only: Stop after the captures, e.g. for a quiescence search.
+        """
+        pieces: list[Piece] = [
+            piece for row in self.grid.array for piece in row if piece.color == self.active_color
+        ]
+
+        if hash_move is not None:
+            hash_piece: Piece = self.grid[hash_move.initial_position]
+            if hash_piece.color == self.active_color and hash_move.final_position in self.get_legal_moves(hash_piece):
+                yield hash_move
+            else:
+                hash_move = None
+
+        captures: list[tuple[float, float, MovementTuple]] = []
+        for piece in pieces:
+            for final_position in self.get_captures(piece):
+                captures.append((-self.grid[final_position].material, piece.material, MovementTuple((piece.position, final_position))))
+        captures.sort(key=lambda capture: (capture[0], capture[1]))
+        for _, _, movement in captures:
+            if not is_same_movement(movement, hash_move):
+                yield movement
+
+        if captures_only:
+            return
+        for piece in pieces:
+            for final_position in self.get_legal_moves(piece):
+                if self.grid[final_position].color == const.EMPTY:
+                    movement = MovementTuple((piece.position, final_position))
+                    if not is_same_movement(movement, hash_move):
+                        yield movement
+
+
     def attacked_by_square(self, attacked_square: PositionTuple, attacked_by_square: PositionTuple) -> bool:
         """Returns True if the attacked_square is attacked by the attacked_by_square."""
 
@@ -127,32 +378,248 @@ class Board:
         return False
     
 
-    def update_is_under_Check(self, king: King) -> None:
-        king.is_under_Check = False
+    def get_legal_move_index(self) -> dict[tuple[int, int], set[tuple[int, int]]]:
+        """
+        Returns every legal move of the active color indexed by square.
+
+        Computed once when a turn starts, it validates any move of that turn with a dictionary lookup instead of a
+        trial move, see get_all_legal_moves.
+
+        Returns:
+            legal_move_index: Dictionary of initial (rank, file) to the set of final (rank, file) it can move to.
+        """
+        legal_move_index: dict[tuple[int, int], set[tuple[int, int]]] = {}
+        for movement in self.get_all_legal_moves():
+            legal_move_index.setdefault(movement.initial_position.position, set()).add(movement.final_position.position)
+        return legal_move_index
+
+
+    def get_all_legal_moves(self) -> list[MovementTuple]:
+        """Returns every move of the active color which does not leave its own King under Check."""
+
+        all_legal_moves: list[MovementTuple] = []
+        for rank in range(const.GRID_SIZE):
+            for file in range(const.GRID_SIZE):
+                piece: Piece = self.grid.array[rank][file]
+                if piece.color != self.active_color:
+                    continue
+                for final_position in self.get_legal_moves(piece):
+                    movement = MovementTuple((piece.position, final_position))
+                    self.make_move(movement)
+                    if not self.is_king_under_Check(piece.color):
+                        all_legal_moves.append(movement)
+                    self.unmake_move()
+        return all_legal_moves
+
+
+    def has_legal_move(self) -> bool:
+        """Returns True if the active color has at least one move which does not leave its own King under Check."""
+
+        color: int = self.active_color
+        for movement in self.generate_moves():
+            self.make_move(movement)
+            is_legal: bool = not self.is_king_under_Check(color)
+            self.unmake_move()
+            if is_legal:
+                return True
+        return False
+
+
+    def is_repetition(self) -> bool:
+        """Returns True if the current position has occurred REPETITIONS_FOR_DRAW times."""
+
+        # Positions before the last capture or Pawn move can never repeat, and only every second one has the same side to move.
+        oldest_index: int = max(len(self.position_history) - 1 - self.halfmove_count, 0)
+        occurrences: int = 0
+        for index in range(len(self.position_history) - 1, oldest_index - 1, -2):
+            if self.position_history[index] == self.hash:
+                occurrences += 1
+                if occurrences >= const.REPETITIONS_FOR_DRAW:
+                    return True
+        return False
+
+
+    def is_insufficient_material(self) -> bool:
+        """Returns True if neither side can checkmate: King against King plus at most one minor piece, or bishops of one square color."""
+
+        for (color, name), count in self.piece_count.items():
+            if count and name in [const.QUEEN, const.ROOK, const.PAWN]:
+                return False
+        minor_pieces: int = sum(
+            count for (color, name), count in self.piece_count.items() if name in [const.BISHOP, const.KNIGHT]
+        )
+        if minor_pieces <= 1:
+            return True
+        if any(count for (color, name), count in self.piece_count.items() if name == const.KNIGHT):
+            return False
+        bishop_square_colors: set[int] = {
+            (piece.position.rank + piece.position.file) % 2
+            for row in self.grid.array for piece in row if piece.name == const.BISHOP
+        }
+        return len(bishop_square_colors) == 1
+
+
+    def get_game_status(self) -> str:
+        """
+        Returns the status of the game.
+
+        Returns:
+            status: One of ONGOING, CHECKMATE, STALEMATE, INSUFFICIENT_MATERIAL, FIFTY_MOVE_RULE or THREEFOLD_REPETITION from constants.
+        """
+        if not self.has_legal_move():
+            return const.CHECKMATE if self.is_king_under_Check(self.active_color) else const.STALEMATE
+        if self.is_insufficient_material():
+            return const.INSUFFICIENT_MATERIAL
+        if self.halfmove_count >= const.FIFTY_MOVE_RULE_HALFMOVES:
+            return const.FIFTY_MOVE_RULE
+        if self.is_repetition():
+            return const.THREEFOLD_REPETITION
+        return const.ONGOING
+
+
+    def is_king_under_Check(self, color: int) -> bool:
+        """Returns True if the King of the given color is attacked, without updating its is_under_Check."""
+
+        king: King = self.grid[self.grid.king_position[color]] #type: ignore
         for piece in king.pieces_to_get_possible_attacking_squares():
             for square in self.get_legal_moves(piece):
                 if self.attacked_by_square(king.position, square):
-                    king.is_under_Check = True
-                    return
+                    return True
+        return False
 
 
-    def make_move(self, movement: MovementTuple) -> None:
-        if not isinstance(self.grid[movement.final_position], Empty):
-            self.captured_pieces.append(self.grid[movement.final_position])
+    def update_is_under_Check(self, king: King) -> None:
+        king.is_under_Check = self.is_king_under_Check(king.color)
+
+
+    def see(self, movement: MovementTuple) -> int:
+        """
+        Static exchange evaluation of a move, without making any move on the board.
+
+        Both sides keep recapturing on movement.final_position with their least valuable attacker, revealing x-ray
+        attackers behind the pieces which have moved, and either side may stop capturing when it would lose material.
+
+        Returns:
+            see: Material won by the side making the move, using the material values of the pieces with
+            SEE_KING_MATERIAL for the King (negative if it loses material). It is in material, not centipawns.
+        """
+        target: PositionTuple = movement.final_position
+        removed: set[tuple[int, int]] = {movement.initial_position.position}
+
+        gain: list[int] = [see_material(self.grid[target])]
+        piece_on_target: Piece = self.grid[movement.initial_position]
+        side: int = (piece_on_target.color + 1) % 2
+
+        while True:
+            attacker: Piece | None = self.least_valuable_attacker(target, side, removed)
+            if attacker is None:
+                break
+            if isinstance(attacker, King) and self.least_valuable_attacker(target, (side + 1) % 2, removed | {attacker.position.position}):
+                break
+            gain.append(see_material(piece_on_target) - gain[-1])
+            piece_on_target = attacker
+            removed.add(attacker.position.position)
+            side = (side + 1) % 2
+
+        for depth in range(len(gain) - 1, 0, -1):
+            gain[depth - 1] = -max(-gain[depth - 1], gain[depth])
+        return gain[0]
+
+
+    def least_valuable_attacker(self, target: PositionTuple, color: int, removed: set[tuple[int, int]]) -> Piece | None:
+        """Returns the least valuable piece of the given color attacking target, treating the removed squares as empty."""
+
+        attackers: list[Piece] = []
+
+        for direction in const.ALL_DIRECTIONS:
+            step: PositionTuple = const.values_for_relative_position[direction]
+            rank, file = target.rank + step.rank, target.file + step.file
+            while 0 <= rank < const.GRID_SIZE and 0 <= file < const.GRID_SIZE:
+                piece: Piece = self.grid.array[rank][file]
+                if piece.color != const.EMPTY and (rank, file) not in removed:
+                    if piece.color == color and piece.can_slide and direction in piece.directions_to_get_possible_moves:
+                        attackers.append(piece)
+                    break
+                rank, file = rank + step.rank, file + step.file
+
+        for values, piece_type in [
+            (Pawn.values_to_calculate_possible_captures_by_color[(color + 1) % 2], Pawn),
+            (Knight.values_to_calculate_possible_moves, Knight),
+            (King.values_to_calculate_possible_moves, King)
+        ]:
+            for value in values:
+                rank, file = target.rank + value.rank, target.file + value.file
+                if 0 <= rank < const.GRID_SIZE and 0 <= file < const.GRID_SIZE and (rank, file) not in removed:
+                    piece: Piece = self.grid.array[rank][file]
+                    if piece.color == color and isinstance(piece, piece_type):
+                        attackers.append(piece)
+
+        return min(attackers, key=lambda piece: piece.material, default=None)
 
-        self.grid[movement.final_position] = self.grid[movement.initial_position]
-        (
-            self.grid[movement.final_position].position,
-            self.grid[movement.final_position].is_moved
-        ) = movement.final_position, True
 
-        if isinstance(self.grid[movement.final_position], King):
-            self.grid.king_position[self.grid[movement.final_position].color] = movement.final_position
+    def make_move(self, movement: MovementTuple) -> None:
+        """Makes the move without checking if it is valid and passes the turn to the other color."""
 
-        self.grid[movement.initial_position] = create_piece(
-            const.symbol_notation_and_material[const.NOTATION][const.EMPTY][const.EMPTY_STR],
-            movement.initial_position
+        piece: Piece = self.grid[movement.initial_position]
+        captured_piece: Piece = self.grid[movement.final_position]
+        self.move_history.append((movement, captured_piece, piece, self.halfmove_count, self.hash, self.pawn_hash, self.en_passant_squares))
+
+        self.hash ^= (
+            zobrist.piece_key(piece.color, piece.name, movement.initial_position.rank, movement.initial_position.file)
+            ^ zobrist.piece_key(piece.color, piece.name, movement.final_position.rank, movement.final_position.file)
+            ^ zobrist.black_to_move_key
         )
+        if not isinstance(captured_piece, Empty):
+            self.captured_pieces.append(captured_piece)
+            self.piece_count[(captured_piece.color, captured_piece.name)] -= 1
+            self.hash ^= zobrist.piece_key(captured_piece.color, captured_piece.name, movement.final_position.rank, movement.final_position.file)
+            if isinstance(captured_piece, Pawn):
+                self.pawn_hash ^= zobrist.piece_key(captured_piece.color, captured_piece.name, movement.final_position.rank, movement.final_position.file)
+        if isinstance(piece, Pawn):
+            self.pawn_hash ^= (
+                zobrist.piece_key(piece.color, piece.name, movement.initial_position.rank, movement.initial_position.file)
+                ^ zobrist.piece_key(piece.color, piece.name, movement.final_position.rank, movement.final_position.file)
+            )
+
+        # The moved piece is replaced by a copy instead of being modified, so boards made by copy can share pieces.
+        self.grid[movement.final_position] = piece.moved_to(movement.final_position)
+
+        if isinstance(piece, King):
+            self.grid.king_position[piece.color] = movement.final_position
+
+        self.grid[movement.initial_position] = empty_squares[movement.initial_position.rank][movement.initial_position.file]
+
+        if isinstance(piece, Pawn) and abs(movement.final_position.rank - movement.initial_position.rank) == 2:
+            skipped_rank: int = (movement.initial_position.rank + movement.final_position.rank) // 2
+            self.en_passant_squares = position_tuple_to_alg_notation(square_positions[skipped_rank][movement.initial_position.file])
+        else:
+            self.en_passant_squares = "-"
+
+        self.halfmove_count = 0 if isinstance(piece, Pawn) or not isinstance(captured_piece, Empty) else self.halfmove_count + 1
+        if self.active_color == const.BLACK:
+            self.fullmove_count += 1
+        self.active_color = (self.active_color + 1) % 2
+        self.position_history.append(self.hash)
+
+
+    def unmake_move(self) -> None:
+        """Takes back the last move made by make_move, restoring any captured piece, the turn and the counters."""
+
+        movement, captured_piece, piece, self.halfmove_count, self.hash, self.pawn_hash, self.en_passant_squares = self.move_history.pop()
+        self.position_history.pop()
+        self.active_color = (self.active_color + 1) % 2
+        if self.active_color == const.BLACK:
+            self.fullmove_count -= 1
+
+        self.grid[movement.initial_position] = piece
+
+        if isinstance(piece, King):
+            self.grid.king_position[piece.color] = movement.initial_position
+
+        self.grid[movement.final_position] = captured_piece
+        if not isinstance(captured_piece, Empty):
+            self.captured_pieces.pop()
+            self.piece_count[(captured_piece.color, captured_piece.name)] += 1
 
     
     def move(self, movement: MovementTuple) -> None:
@@ -172,20 +639,44 @@ class Board:
 
         self.make_move(movement)
 
+        if self.is_king_under_Check(piece_to_move.color):
+            self.unmake_move()
+            raise errors.KingStillUnderCheck
+
         for king_position in self.grid.king_position.values():
             self.update_is_under_Check(self.grid[king_position]) #type: ignore
 
-        active_players_king: King = self.grid[self.grid.king_position[self.active_color]] #type: ignore
-        if active_players_king.is_under_Check:
-            self.make_move(MovementTuple((movement.final_position, movement.initial_position)))
-            raise errors.KingStillUnderCheck
-        
-        self.active_color = (self.active_color + 1) % 2
-        self.halfmove_count += 1
-        if self.active_color == const.BLACK:
-            self.fullmove_count += 1
 
 
+def see_material(piece: Piece) -> int:
+    """Returns the material of the piece, with a finite value for the King whose material is infinite."""
+
+    return const.SEE_KING_MATERIAL if isinstance(piece, King) else piece.material
+
+
+def is_same_movement(movement: MovementTuple, other: MovementTuple | None) -> bool:
+    """Returns True if both MovementTuples move from and to the same squares."""
+
+    return (
+        other is not None
+        and movement.initial_position == other.initial_position
+        and movement.final_position == other.final_position
+    )
+
+
+
+# One shared PositionTuple for every square, PositionTuples are never modified after creation.
+square_positions: list[list[PositionTuple]] = [
+    [PositionTuple((rank, file)) for file in range(const.GRID_SIZE)] for rank in range(const.GRID_SIZE)
+]
+
+
+# One shared Empty for every square, Empty pieces are never modified so every Board can use the same ones.
+empty_squares: list[list[Piece]] = [
+    [create_piece(const.symbol_notation_and_material[const.NOTATION][const.EMPTY][const.EMPTY_STR], position) for position in row]
+    for row in square_positions
+]
+
 
 class Grid:
     """
@@ -206,9 +697,9 @@ class Grid:
 
             for file in range(const.GRID_SIZE):
                 piece_notation = piece_placement[rank][file]
-                position = PositionTuple((rank, file))
+                position = square_positions[rank][file]
                 
-                temp_piece: Piece = create_piece(piece_notation, position)
+                temp_piece: Piece = create_piece(piece_notation, position) if piece_notation in piece_classes else empty_squares[rank][file]
                 if isinstance(temp_piece, King):
                     self.king_position[temp_piece.color] = temp_piece.position
                 temp_list.append(temp_piece)
@@ -1,3 +1,4 @@
+from typing import TextIO
 import sys
 import os
 
@@ -19,6 +20,11 @@ def main_cli(starting_fen: str) -> None:
         # clear_screen()
         board.display()
 
+        status: str = board.get_game_status()
+        if status != const.ONGOING:
+            print(f"{const.BOLD}Game over: {status}.{const.RESET}")
+            return
+
         if board.grid[board.grid.king_position[board.active_color]].is_under_Check: #type: ignore
             print(f"{const.RED}Your king is under Check!{const.RESET}")
 
@@ -34,6 +40,48 @@ def main_cli(starting_fen: str) -> None:
                 break
 
 
+def main_batch(starting_fen: str, moves_file: TextIO, fen_output: bool = False, keep_going: bool = False) -> int:
+    """
+    Plays every move from moves_file, one per line, without rendering anything in between.
+
+    The final board (or its FEN string), the game status and any errors are written to stdout at once at the end.
+    The first invalid move is reported and stops the game there, as the moves after it were meant for another
+    position. With keep_going, invalid moves are reported and skipped like in main_cli instead. A line 'exit' stops
+    reading.
+
+    Returns:
+        exit_code: 0 if every move was played, 1 otherwise.
+    """
+    try:
+        board = Board(starting_fen)
+    except errors.InvalidFEN:
+        sys.stdout.write("Invalid FEN string passed.\n")
+        return 1
+
+    output: list[str] = []
+    for line_number, line in enumerate(moves_file, start=1):
+        input_str: str = line.strip()
+        if not input_str:
+            continue
+        if input_str.lower() == "exit":
+            break
+        try:
+            board.move(input_str_to_movement_tuple(input_str))
+        except errors.CustomException as e:
+            output.append(f"Line {line_number}: {input_str}: {e}")
+            if not keep_going:
+                output.append(f"Stopped at line {line_number}, the position before this move follows.")
+                break
+
+    exit_code: int = 1 if output else 0
+    output.append(board.to_fen() if fen_output else board.render())
+    status: str = board.get_game_status()
+    if status != const.ONGOING:
+        output.append(f"Game over: {status}.")
+    sys.stdout.write("\n".join(output) + "\n")
+    return exit_code
+
+
 def clear_screen() -> None:
     """Clears the screen of the terminal."""
     if os.name == "nt":
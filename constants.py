@@ -133,4 +133,72 @@ BOLD: str = "\033[1m"
 RED: str = "\033[31m"
 RESET: str = "\033[0m"
 
-SENTINAL_POSITION: PositionTuple = PositionTuple((-1, -1))
\ No newline at end of file
+SENTINAL_POSITION: PositionTuple = PositionTuple((-1, -1))
+
+# Constants for the game server
+SERVER_HOST: str = "127.0.0.1"
+SERVER_PORT: int = 8765
+SESSION_IDLE_TIMEOUT: float = 300.0
+SESSION_EVICTION_INTERVAL: float = 10.0
+MAX_SESSIONS: int = 100_000
+
+
+# Constants for game status
+ONGOING: str = "ongoing"
+CHECKMATE: str = "checkmate"
+STALEMATE: str = "stalemate"
+THREEFOLD_REPETITION: str = "threefold repetition"
+FIFTY_MOVE_RULE: str = "fifty-move rule"
+INSUFFICIENT_MATERIAL: str = "insufficient material"
+
+FIFTY_MOVE_RULE_HALFMOVES: int = 100
+REPETITIONS_FOR_DRAW: int = 3
+
+# Seed of the random numbers used for Zobrist hashing, fixed so hashes stay the same across runs
+ZOBRIST_SEED: int = 2135
+
+# Constants for the engine, scores are in centipawns from the point of view of the side to move
+CENTIPAWNS_PER_MATERIAL: int = 100
+MATE_SCORE: int = 100_000
+# Scores within this many plies of MATE_SCORE are mate scores
+MAX_MATE_PLY: int = 1000
+DEFAULT_SEARCH_DEPTH: int = 3
+MAX_SEARCH_DEPTH: int = 64
+# Material of the King in the static exchange evaluation, finite and more than all other pieces together
+SEE_KING_MATERIAL: int = 100
+
+# Pawn structure terms of the evaluation, PASSED_PAWN_BONUS is indexed by the number of ranks the Pawn has advanced
+DOUBLED_PAWN_PENALTY: int = 15
+ISOLATED_PAWN_PENALTY: int = 12
+PASSED_PAWN_BONUS: list[int] = [0, 5, 10, 20, 35, 60, 100]
+# Number of entries of the pawn evaluation cache, a power of 2
+PAWN_CACHE_SIZE: int = 1 << 14
+
+# Number of games written to the position database per transaction
+POSITION_DB_BATCH_SIZE: int = 500
+
+# Castling sides in the order used by the modified FEN string and by Board.castling_availability
+CASTLING_SIDES: list[str] = [
+    symbol_notation_and_material[NOTATION][WHITE][KING],
+    symbol_notation_and_material[NOTATION][WHITE][QUEEN],
+    symbol_notation_and_material[NOTATION][BLACK][KING],
+    symbol_notation_and_material[NOTATION][BLACK][QUEEN]
+]
+
+# Color (RGBA) drawn over the squares the dragged piece can move to
+HIGHLIGHT_COLOR: tuple[int, int, int, int] = (80, 200, 120, 110)
+
+# Constants for the transposition table
+TT_EXACT: int = 0
+TT_LOWER_BOUND: int = 1
+TT_UPPER_BOUND: int = 2
+TT_DEFAULT_SIZE_MB: int = 16
+# Helpers check if the search was stopped by another process once every this many nodes
+STOP_CHECK_INTERVAL: int = 1024
+# Seconds between checks of parallel_search for worker processes which died without reporting
+WORKER_POLL_INTERVAL: float = 0.5
+
+# Constants for the training data exporter
+TRAINING_CHUNK_SIZE: int = 1 << 16
+TRAINING_GAMES_PER_TASK: int = 64
+TRAINING_FENS_PER_TASK: int = 4096
@@ -0,0 +1,398 @@
+from typing import Any
+import multiprocessing
+import queue
+import time
+import traceback
+
+import constants as const
+from board import Board, PackedBoard
+from positions import MovementTuple
+from evaluation import evaluate
+from transposition import TranspositionTable
+
+
+
+class SearchStopped(Exception):
+    """Raised inside the search when its time or node limit is reached."""
+
+
+
+class SearchFailed(Exception):
+    """Raised by parallel_search when no worker process returned a result."""
+
+
+
+class SearchResult:
+    """
+    Result of a search.
+
+    Attributes:
+        best_move: Best move found, None if the active color has no legal move.
+        score: Score of best_move in centipawns from the point of view of the active color.
+        depth: Depth of the last completed iteration.
+        nodes: Number of positions searched, including quiescence.
+        elapsed: Time taken by the search in seconds.
+        iterations: (depth, best move, nodes, elapsed) at the end of every completed iteration.
+    """
+
+    def __init__(
+        self,
+        best_move: MovementTuple | None,
+        score: int,
+        depth: int,
+        nodes: int,
+        elapsed: float,
+        iterations: list[tuple[int, MovementTuple | None, int, float]] | None = None
+    ) -> None:
+        self.best_move: MovementTuple | None = best_move
+        self.score: int = score
+        self.depth: int = depth
+        self.nodes: int = nodes
+        self.elapsed: float = elapsed
+        self.iterations: list[tuple[int, MovementTuple | None, int, float]] = iterations if iterations is not None else []
+
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+
+
+class Search:
+    """
+    Iterative deepening alpha-beta search with a quiescence search on captures.
+
+    Args:
+        board: Board to search, it is used to make and unmake moves and is left unchanged afterwards.
+        max_depth: Depth of the last iteration.
+        time_limit: Seconds after which the search stops, None for no limit.
+        node_limit: Number of nodes after which the search stops, None for no limit.
+        transposition_table: Table of earlier results used for cutoffs and move ordering, None to search without one.
+        start_depth: Depth of the first iteration, helpers of a parallel search start deeper than the main search.
+        stop_event: Event set by another process to stop the search, None if only the limits stop it.
+
+    Attributes:
+        nodes: Number of positions searched so far.
+        deadline: Value of time.perf_counter() at which the search stops, None for no limit.
+        is_path_dependent: True if the score last returned by negamax rests on a draw by repetition or the fifty-move
+            rule, which depend on the moves leading to the position and not only on its hash.
+    """
+
+    def __init__(
+        self,
+        board: Board,
+        max_depth: int = const.DEFAULT_SEARCH_DEPTH,
+        time_limit: float | None = None,
+        node_limit: int | None = None,
+        transposition_table: TranspositionTable | None = None,
+        start_depth: int = 1,
+        stop_event: Any = None
+    ) -> None:
+        self.board: Board = board
+        self.max_depth: int = max_depth
+        self.time_limit: float | None = time_limit
+        self.node_limit: int | None = node_limit
+        self.transposition_table: TranspositionTable | None = transposition_table
+        self.start_depth: int = min(start_depth, max_depth)
+        self.stop_event: Any = stop_event
+        self.nodes: int = 0
+        self.deadline: float | None = None
+        self.is_path_dependent: bool = False
+
+
+    def run(self) -> SearchResult:
+        """Searches one more ply per iteration and returns the result of the last completed iteration."""
+
+        start: float = time.perf_counter()
+        self.nodes = 0
+        self.deadline = start + self.time_limit if self.time_limit is not None else None
+
+        best_move: MovementTuple | None = None
+        score: int = 0
+        completed_depth: int = 0
+        iterations: list[tuple[int, MovementTuple | None, int, float]] = []
+        for depth in range(self.start_depth, self.max_depth + 1):
+            try:
+                score, move = self.search_root(depth, best_move)
+            except SearchStopped:
+                break
+            best_move, completed_depth = move, depth
+            iterations.append((depth, move, self.nodes, time.perf_counter() - start))
+            if move is None or abs(score) >= const.MATE_SCORE - const.MAX_MATE_PLY:
+                break
+
+        if best_move is None and completed_depth == 0:
+            # Stopped before even the first iteration finished, fall back to any legal move.
+            legal_moves: list[MovementTuple] = self.board.get_all_legal_moves()
+            best_move = legal_moves[0] if legal_moves else None
+
+        return SearchResult(best_move, score, completed_depth, self.nodes, time.perf_counter() - start, iterations)
+
+
+    def search_root(self, depth: int, previous_best_move: MovementTuple | None) -> tuple[int, MovementTuple | None]:
+        """Searches the root to the given depth, trying the best move of the previous iteration first."""
+
+        board: Board = self.board
+        color: int = board.active_color
+        alpha: int = -const.MATE_SCORE - 1
+        best_move: MovementTuple | None = None
+
+        for movement in board.generate_moves(previous_best_move):
+            board.make_move(movement)
+            try:
+                if board.is_king_under_Check(color):
+                    continue
+                score: int = -self.negamax(depth - 1, -const.MATE_SCORE - 1, -alpha, 1)
+            finally:
+                board.unmake_move()
+            if score > alpha:
+                alpha, best_move = score, movement
+
+        if best_move is None:
+            return (-const.MATE_SCORE if board.is_king_under_Check(color) else 0), None
+        return alpha, best_move
+
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Returns the score of the position from the point of view of the active color.
+
+        The score is fail-soft: at or below alpha it is an upper bound and at or above beta a lower bound, the same
+        value as stored in the transposition table.
+        """
+        self.count_node()
+        board: Board = self.board
+        if board.halfmove_count >= const.FIFTY_MOVE_RULE_HALFMOVES or board.is_repetition():
+            self.is_path_dependent = True
+            return 0
+        self.is_path_dependent = False
+        if depth <= 0:
+            return self.quiescence(alpha, beta)
+
+        table: TranspositionTable | None = self.transposition_table
+        hash_move: MovementTuple | None = None
+        original_alpha: int = alpha
+        if table is not None:
+            entry: tuple[int, int, int, MovementTuple | None] | None = table.probe(board.hash)
+            if entry is not None:
+                entry_depth, flag, entry_score, hash_move = entry
+                entry_score = score_from_table(entry_score, ply)
+                if entry_depth >= depth:
+                    if flag == const.TT_EXACT:
+                        return entry_score
+                    if flag == const.TT_LOWER_BOUND:
+                        alpha = max(alpha, entry_score)
+                    elif flag == const.TT_UPPER_BOUND:
+                        beta = min(beta, entry_score)
+                    if alpha >= beta:
+                        return entry_score
+
+        color: int = board.active_color
+        has_legal_move: bool = False
+        best_score: int = -const.MATE_SCORE - 1
+        best_move: MovementTuple | None = None
+        best_is_path_dependent: bool = False
+        any_is_path_dependent: bool = False
+        for movement in board.generate_moves(hash_move):
+            board.make_move(movement)
+            try:
+                if board.is_king_under_Check(color):
+                    continue
+                has_legal_move = True
+                score: int = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move()
+            any_is_path_dependent = any_is_path_dependent or self.is_path_dependent
+            if score > best_score:
+                best_score, best_move, best_is_path_dependent = score, movement, self.is_path_dependent
+            if score >= beta:
+                break
+            alpha = max(alpha, score)
+
+        if not has_legal_move:
+            return -const.MATE_SCORE + ply if board.is_king_under_Check(color) else 0
+
+        # A lower bound rests only on the move which failed high, any other score on every move searched.
+        self.is_path_dependent = best_is_path_dependent if best_score >= beta else any_is_path_dependent
+        # The table is keyed by the hash alone, so scores resting on the path to the position would be wrong elsewhere.
+        if table is not None and not self.is_path_dependent:
+            if best_score >= beta:
+                flag = const.TT_LOWER_BOUND
+            elif best_score <= original_alpha:
+                flag = const.TT_UPPER_BOUND
+            else:
+                flag = const.TT_EXACT
+            table.store(board.hash, depth, flag, score_to_table(best_score, ply), best_move)
+        return best_score
+
+
+    def quiescence(self, alpha: int, beta: int) -> int:
+        """Searches only captures which do not lose material, so the static evaluation is never taken mid exchange."""
+
+        board: Board = self.board
+        stand_pat: int = evaluate(board)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        color: int = board.active_color
+        for movement in board.generate_moves(captures_only=True):
+            if board.see(movement) < 0:
+                continue
+            self.count_node()
+            board.make_move(movement)
+            try:
+                if board.is_king_under_Check(color):
+                    continue
+                score: int = -self.quiescence(-beta, -alpha)
+            finally:
+                board.unmake_move()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+
+    def count_node(self) -> None:
+        """Counts a node and raises SearchStopped once a limit is reached."""
+
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchStopped
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchStopped
+        if self.stop_event is not None and self.nodes % const.STOP_CHECK_INTERVAL == 0 and self.stop_event.is_set():
+            raise SearchStopped
+
+
+def score_to_table(score: int, ply: int) -> int:
+    """Mate scores are stored as distance to mate from the stored position instead of from the root."""
+
+    if score >= const.MATE_SCORE - const.MAX_MATE_PLY:
+        return score + ply
+    if score <= -const.MATE_SCORE + const.MAX_MATE_PLY:
+        return score - ply
+    return score
+
+
+def score_from_table(score: int, ply: int) -> int:
+    if score >= const.MATE_SCORE - const.MAX_MATE_PLY:
+        return score - ply
+    if score <= -const.MATE_SCORE + const.MAX_MATE_PLY:
+        return score + ply
+    return score
+
+
+def search(
+    board: Board,
+    max_depth: int = const.DEFAULT_SEARCH_DEPTH,
+    time_limit: float | None = None,
+    node_limit: int | None = None,
+    transposition_table: TranspositionTable | None = None
+) -> SearchResult:
+    """Searches the position on board and returns the best move found within the limits."""
+
+    return Search(board, max_depth, time_limit, node_limit, transposition_table).run()
+
+
+def parallel_search(
+    board: Board,
+    workers: int,
+    max_depth: int = const.DEFAULT_SEARCH_DEPTH,
+    time_limit: float | None = None,
+    node_limit: int | None = None,
+    table_size_mb: int = const.TT_DEFAULT_SIZE_MB
+) -> SearchResult:
+    """
+    Lazy SMP: searches the position in several processes sharing one transposition table in shared memory.
+
+    Every worker searches the same root, odd workers starting one ply deeper, and they only cooperate through the
+    table. When the first worker finishes all others are stopped, and the result of the deepest completed search is
+    returned, with the nodes of all workers.
+
+    A worker which fails is left out of the result, SearchFailed is raised only if every worker failed.
+
+    Args:
+        workers: Number of processes searching, at least 1.
+        node_limit: Nodes per worker.
+    """
+    if workers < 1:
+        raise ValueError("parallel_search needs at least one worker.")
+
+    table, memory = TranspositionTable.create_shared(table_size_mb)
+    del table
+    stop_event = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes: list[multiprocessing.Process] = [
+        multiprocessing.Process(
+            target=search_worker,
+            args=(board.pack(), board.position_history, memory.name, 1 + index % 2, max_depth, time_limit, node_limit, stop_event, results)
+        )
+        for index in range(workers)
+    ]
+
+    start: float = time.perf_counter()
+    try:
+        for process in processes:
+            process.start()
+        worker_results: list[SearchResult] = []
+        failures: list[str] = []
+        died: int = 0
+        while len(worker_results) + len(failures) + died < workers:
+            try:
+                result: SearchResult | str = results.get(timeout=const.WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                # A worker killed before it could report, e.g. by a signal, never puts anything on the queue.
+                died = sum(process.exitcode not in [None, 0] for process in processes)
+                continue
+            if isinstance(result, str):
+                failures.append(result)
+            else:
+                worker_results.append(result)
+            stop_event.set()
+        for process in processes:
+            process.join()
+    finally:
+        stop_event.set()
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        memory.close()
+        memory.unlink()
+
+    if not worker_results:
+        raise SearchFailed("\n".join(failures + ["worker process died"] * died))
+    best: SearchResult = max(worker_results, key=lambda result: result.depth)
+    best.nodes = sum(result.nodes for result in worker_results)
+    best.elapsed = time.perf_counter() - start
+    return best
+
+
+def search_worker(
+    packed_board: PackedBoard,
+    position_history: list[int],
+    table_name: str,
+    start_depth: int,
+    max_depth: int,
+    time_limit: float | None,
+    node_limit: int | None,
+    stop_event: Any,
+    results: Any
+) -> None:
+    """
+    Runs one search of parallel_search in a worker process and puts its SearchResult on the results queue, or the
+    traceback of the error if it failed.
+    """
+    try:
+        table, memory = TranspositionTable.attach_shared(table_name)
+    except Exception:
+        results.put(traceback.format_exc())
+        return
+    try:
+        board: Board = Board.from_packed(packed_board, position_history)
+        results.put(Search(board, max_depth, time_limit, node_limit, table, start_depth, stop_event).run())
+    except Exception:
+        results.put(traceback.format_exc())
+    finally:
+        del table
+        memory.close()
@@ -0,0 +1,220 @@
+import argparse
+import multiprocessing
+import sys
+import time
+
+import constants as const
+from board import Board, is_same_movement
+from engine import Search, SearchResult
+from positions import MovementTuple
+from pgn import movement_to_san, san_to_movement
+from transposition import TranspositionTable
+import errors
+import fen
+
+
+
+class EpdPosition:
+    """
+    One position of an EPD test suite.
+
+    Args:
+        index: Index of the position in the suite.
+        fen_string: FEN string of the position.
+        operations: EPD operations of the position, e.g. {'bm': 'Qg6', 'id': 'WAC.001'}.
+    """
+
+    def __init__(self, index: int, fen_string: str, operations: dict[str, str]) -> None:
+        self.index: int = index
+        self.fen_string: str = fen_string
+        self.operations: dict[str, str] = operations
+        self.id: str = operations.get("id", str(index + 1))
+
+
+
+class SearchLimits:
+    """
+    Budget of the search of every position.
+
+    Args:
+        max_depth: Maximum search depth.
+        time_limit: Seconds per position, None for no limit.
+        node_limit: Nodes per position, None for no limit.
+        table_size_mb: Size of the transposition table of every search.
+    """
+
+    def __init__(self, max_depth: int, time_limit: float | None, node_limit: int | None, table_size_mb: int) -> None:
+        self.max_depth: int = max_depth
+        self.time_limit: float | None = time_limit
+        self.node_limit: int | None = node_limit
+        self.table_size_mb: int = table_size_mb
+
+
+
+class EpdResult:
+    """
+    Outcome of one position, sent back from the worker process.
+
+    Attributes:
+        index: Index of the position in the suite.
+        id: Id of the position.
+        solved: True if the move found is a best move ('bm') and not an avoid move ('am').
+        move: Move found in Standard Algebraic Notation, None if the position could not be searched.
+        expected: The 'bm' and 'am' operations, e.g. 'bm Qg6'.
+        depth: Depth of the last completed iteration.
+        nodes: Nodes searched.
+        elapsed: Seconds spent searching.
+        solution_time: Seconds until the search settled on a solution, None if it was not solved.
+        solution_nodes: Nodes until the search settled on a solution, None if it was not solved.
+        error: Why the position could not be searched, None if it was.
+    """
+
+    def __init__(self, position: EpdPosition, expected: str) -> None:
+        self.index: int = position.index
+        self.id: str = position.id
+        self.expected: str = expected
+        self.solved: bool = False
+        self.move: str | None = None
+        self.depth: int = 0
+        self.nodes: int = 0
+        self.elapsed: float = 0.0
+        self.solution_time: float | None = None
+        self.solution_nodes: int | None = None
+        self.error: str | None = None
+
+
+def load_epd(path: str) -> list[EpdPosition]:
+    """Reads one EPD position per line from the file, skipping blank lines and lines starting with '#'."""
+
+    positions: list[EpdPosition] = []
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parsed: tuple[str, dict[str, str]] | None = fen.epd_parser(line)
+            if not parsed:
+                raise errors.InvalidFEN
+            positions.append(EpdPosition(len(positions), *parsed))
+    return positions
+
+
+def is_solution(movement: MovementTuple | None, best_moves: list[MovementTuple], avoid_moves: list[MovementTuple]) -> bool:
+    if movement is None:
+        return False
+    if best_moves and not any(is_same_movement(movement, best_move) for best_move in best_moves):
+        return False
+    return not any(is_same_movement(movement, avoid_move) for avoid_move in avoid_moves)
+
+
+def solve(task: tuple[EpdPosition, SearchLimits]) -> EpdResult:
+    """Searches one position of the suite within the limits, in a worker process."""
+
+    position, limits = task
+    expected: str = "; ".join(f"{opcode} {position.operations[opcode]}" for opcode in ["bm", "am"] if opcode in position.operations)
+    epd_result = EpdResult(position, expected)
+
+    board = Board(position.fen_string)
+    try:
+        best_moves: list[MovementTuple] = [san_to_movement(board, san) for san in position.operations.get("bm", "").split()]
+        avoid_moves: list[MovementTuple] = [san_to_movement(board, san) for san in position.operations.get("am", "").split()]
+    except errors.InvalidMove:
+        epd_result.error = "unreadable bm or am move"
+        return epd_result
+    if not best_moves and not avoid_moves:
+        epd_result.error = "no bm or am operation"
+        return epd_result
+
+    table: TranspositionTable = TranspositionTable.create(limits.table_size_mb)
+    result: SearchResult = Search(board, limits.max_depth, limits.time_limit, limits.node_limit, table).run()
+    epd_result.move = movement_to_san(board, result.best_move) if result.best_move is not None else None
+    epd_result.solved = is_solution(result.best_move, best_moves, avoid_moves)
+    epd_result.depth = result.depth
+    epd_result.nodes = result.nodes
+    epd_result.elapsed = result.elapsed
+
+    # The solution is found at the first iteration from which every later iteration kept a solution.
+    if epd_result.solved:
+        for _, movement, nodes, elapsed in reversed(result.iterations):
+            if not is_solution(movement, best_moves, avoid_moves):
+                break
+            epd_result.solution_nodes, epd_result.solution_time = nodes, elapsed
+        if epd_result.solution_time is None:
+            # Stopped before the first iteration finished, with the fallback move being a solution.
+            epd_result.solution_nodes, epd_result.solution_time = result.nodes, result.elapsed
+    return epd_result
+
+
+def run_suite(positions: list[EpdPosition], workers: int, limits: SearchLimits) -> int:
+    """Solves the positions across a process pool, printing each result as it finishes, and returns the number solved."""
+
+    solved: int = 0
+    errors_count: int = 0
+    nodes: int = 0
+    search_time: float = 0.0
+    solution_times: list[float] = []
+    start: float = time.perf_counter()
+
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(solve, [(position, limits) for position in positions]):
+            if result.error is not None:
+                errors_count += 1
+                print(f"{result.id}: skipped, {result.error}")
+                continue
+            nodes += result.nodes
+            search_time += result.elapsed
+            if result.solved:
+                solved += 1
+                solution_times.append(result.solution_time) #type: ignore
+                outcome: str = f"solved in {result.solution_time:.2f}s ({result.solution_nodes} nodes)"
+            else:
+                outcome = "not solved"
+            print(f"{result.id}: {result.move} ({result.expected}) {outcome}, depth {result.depth}")
+
+    elapsed: float = time.perf_counter() - start
+    searched: int = len(positions) - errors_count
+    print(f"Solved: {solved}/{searched}" + (f", skipped {errors_count}" if errors_count else ""))
+    if solution_times:
+        print(f"Average time to solution: {sum(solution_times) / len(solution_times):.2f}s")
+    print(f"Positions: {len(positions)} in {elapsed:.1f}s ({len(positions) / elapsed:.2f} positions/s)")
+    print(f"Aggregate nps: {nodes / search_time if search_time else 0:.0f} per worker, {nodes / elapsed:.0f} in total")
+    return solved
+
+
+class Args:
+    def __init__(self) -> None:
+        self.suite: str
+        self.workers: int
+        self.depth: int
+        self.movetime: float | None
+        self.nodes: int | None
+        self.hash: int
+
+
+def main_epd() -> None:
+    parser = argparse.ArgumentParser(
+        prog="epd.py"
+    )
+    args = Args()
+    parser.add_argument("suite", help="EPD file with one position and its operations per line.")
+    parser.add_argument("-w", "--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--depth", type=int, default=const.MAX_SEARCH_DEPTH, help="Maximum search depth.")
+    parser.add_argument("--movetime", type=float, default=None, help="Seconds per position.")
+    parser.add_argument("--nodes", type=int, default=None, help="Nodes per position.")
+    parser.add_argument("--hash", type=int, default=const.TT_DEFAULT_SIZE_MB, help="Transposition table size in MB of every worker.")
+    parser.parse_args(namespace=args)
+
+    if args.movetime is None and args.nodes is None:
+        args.movetime = 1.0
+
+    try:
+        positions: list[EpdPosition] = load_epd(args.suite)
+    except errors.InvalidFEN:
+        print("Invalid EPD position in the suite.")
+        sys.exit(1)
+
+    run_suite(positions, args.workers, SearchLimits(args.depth, args.movetime, args.nodes, args.hash))
+
+
+if __name__ == "__main__":
+    main_epd()
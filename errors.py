@@ -23,4 +23,16 @@ class KingStillUnderCheck(CustomException):
 
 class InvalidTurn(CustomException):
     def __init__(self):
-        super().__init__("Invalid turn!")
\ No newline at end of file
+        super().__init__("Invalid turn!")
+
+class SessionNotFound(CustomException):
+    def __init__(self):
+        super().__init__("No such session!")
+
+class InvalidRequest(CustomException):
+    def __init__(self):
+        super().__init__("Invalid request!")
+
+class InternalError(CustomException):
+    def __init__(self):
+        super().__init__("Internal server error!")
\ No newline at end of file
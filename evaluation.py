@@ -0,0 +1,112 @@
+import constants as const
+from board import Board
+from pieces import Piece, Pawn
+
+
+
+class PawnCache:
+    """
+    Fixed size cache of pawn structure scores, keyed by Board.pawn_hash.
+
+    Pawns move in few of the positions searched, so most positions find the score of their pawn structure here. An
+    entry is overwritten by any other pawn structure falling in the same slot.
+
+    Args:
+        size: Number of entries, a power of 2.
+
+    Attributes:
+        hits: Number of probes which found the score.
+        probes: Number of probes.
+    """
+
+    def __init__(self, size: int = const.PAWN_CACHE_SIZE) -> None:
+        self.mask: int = size - 1
+        self.keys: list[int | None] = [None] * size
+        self.scores: list[int] = [0] * size
+        self.hits: int = 0
+        self.probes: int = 0
+
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+
+    def score(self, board: Board) -> int:
+        """Returns the pawn structure score of the board from the point of view of White, computing it on a miss."""
+
+        self.probes += 1
+        index: int = board.pawn_hash & self.mask
+        if self.keys[index] == board.pawn_hash:
+            self.hits += 1
+            return self.scores[index]
+
+        score: int = pawn_structure(board)
+        self.keys[index] = board.pawn_hash
+        self.scores[index] = score
+        return score
+
+
+# Cache used by evaluate, one per process.
+pawn_cache = PawnCache()
+
+
+def evaluate(board: Board) -> int:
+    """Returns the static evaluation of the position in centipawns, from the point of view of the active color."""
+
+    score: int = pawn_cache.score(board)
+    for row in board.grid.array:
+        for piece in row:
+            if piece.color == const.EMPTY or piece.name == const.KING:
+                continue
+            value: int = piece.material * const.CENTIPAWNS_PER_MATERIAL + positional_bonus(piece)
+            score += value if piece.color == const.WHITE else -value
+    return score if board.active_color == const.WHITE else -score
+
+
+def positional_bonus(piece: Piece) -> int:
+    """Returns a small bonus for centralized minor pieces and advanced pawns."""
+
+    if piece.name in [const.KNIGHT, const.BISHOP]:
+        distance_from_center: float = max(abs(piece.position.rank - 3.5), abs(piece.position.file - 3.5))
+        return int((3.5 - distance_from_center) * 10)
+    if piece.name == const.PAWN:
+        return abs(piece.position.rank - Pawn.starting_rank[piece.color]) * 5
+    return 0
+
+
+def pawn_structure(board: Board) -> int:
+    """Returns the penalties for doubled and isolated Pawns and the bonus for passed Pawns, from the point of view of White."""
+
+    # Ranks of the Pawns of every color on every file.
+    pawn_ranks: list[list[list[int]]] = [[[] for _ in range(const.GRID_SIZE)] for _ in [const.WHITE, const.BLACK]]
+    for row in board.grid.array:
+        for piece in row:
+            if isinstance(piece, Pawn):
+                pawn_ranks[piece.color][piece.position.file].append(piece.position.rank)
+
+    score: int = 0
+    for color in [const.WHITE, const.BLACK]:
+        own: list[list[int]] = pawn_ranks[color]
+        enemy: list[list[int]] = pawn_ranks[(color + 1) % 2]
+        # White Pawns move towards rank 0 and Black Pawns towards rank 7.
+        direction: int = -1 if color == const.WHITE else 1
+        color_score: int = 0
+        for file in range(const.GRID_SIZE):
+            if not own[file]:
+                continue
+            color_score -= (len(own[file]) - 1) * const.DOUBLED_PAWN_PENALTY
+            neighbour_files: list[int] = [other for other in [file - 1, file + 1] if 0 <= other < const.GRID_SIZE]
+            if not any(own[other] for other in neighbour_files):
+                color_score -= len(own[file]) * const.ISOLATED_PAWN_PENALTY
+            for rank in own[file]:
+                is_passed: bool = not any(
+                    (enemy_rank - rank) * direction > 0
+                    for other in [file, *neighbour_files]
+                    for enemy_rank in enemy[other]
+                )
+                if is_passed:
+                    advanced: int = abs(rank - Pawn.starting_rank[color])
+                    color_score += const.PASSED_PAWN_BONUS[min(advanced, len(const.PASSED_PAWN_BONUS) - 1)]
+        score += color_score if color == const.WHITE else -color_score
+    return score
@@ -34,6 +34,14 @@ def fen_parser(fen_string: str) -> dict[str, Any] | None:
     return FEN_data
 
 
+def has_one_king_per_color(FEN_data: dict[str, Any]) -> bool:
+    """Returns True if each color has exactly one King in the data returned by fen_parser, which Board relies on."""
+
+    piece_placement: str = "".join(FEN_data["piece_placement_data"])
+    notations: list[dict[str, str]] = const.symbol_notation_and_material[const.NOTATION]
+    return all(piece_placement.count(notations[color][const.KING]) == 1 for color in [const.WHITE, const.BLACK])
+
+
 def modified_FEN_string_validator(modified_FEN: str) -> bool:
     '''Takes modified FEN as input and returns True if it is valid.'''
 
@@ -85,3 +93,25 @@ def modified_castling_availability(castling_availability: list[str]):
             modified_castling_availability += "0"
     
     return modified_castling_availability
+
+
+def epd_parser(epd_string: str) -> tuple[str, dict[str, str]] | None:
+    """
+    Takes an EPD line and returns the FEN string of its position and its operations, e.g. {'bm': 'Qxf7+', 'id': 'WAC.001'}.
+
+    The halfmove and fullmove counts of the FEN string are taken from the 'hmvc' and 'fmvn' operations, or are 0 and 1.
+    Returns None if the position is not valid or a color does not have exactly one King.
+    """
+    fields: list[str] = epd_string.strip().split(maxsplit=4)
+    if len(fields) < 4:
+        return None
+
+    operations: dict[str, str] = {}
+    for opcode, operand in re.findall(r'(\w+)\s*((?:"[^"]*"|[^;])*);', fields[4] if len(fields) == 5 else ""):
+        operations[opcode] = operand.strip().strip('"')
+
+    fen_string: str = " ".join([*fields[:4], operations.get("hmvc", "0"), operations.get("fmvn", "1")])
+    FEN_data: dict[str, Any] | None = fen_parser(fen_string)
+    if not FEN_data or not has_one_king_per_color(FEN_data):
+        return None
+    return fen_string, operations
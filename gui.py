@@ -26,6 +26,11 @@ def main_gui(starting_fen: str):
     all_sprites: AllSprites = AllSprites(board)
     backup_sprites: list[PieceSprite] = all_sprites.create_backup()
 
+    # Every legal move of the turn, computed once when the turn starts, so a drop is validated with a lookup.
+    legal_move_index: dict[tuple[int, int], set[tuple[int, int]]] = board.get_legal_move_index()
+    highlight: pygame.Surface = pygame.Surface((const.GRID_BOX_SIZE, const.GRID_BOX_SIZE), pygame.SRCALPHA)
+    highlight.fill(const.HIGHLIGHT_COLOR)
+
     running: bool = True
     dragging: bool = False
     dragged_sprite_index: int = 0
@@ -71,10 +76,25 @@ def main_gui(starting_fen: str):
         try:
             if (not initial_position.is_out_of_bounds()) and  (not final_position.is_out_of_bounds()):
                 print(initial_position, final_position)
-                board.move(MovementTuple((initial_position, final_position)))
+                movement = MovementTuple((initial_position, final_position))
+                if final_position.position in legal_move_index.get(initial_position.position, set()):
+                    board.make_move(movement)
+                    for king_position in board.grid.king_position.values():
+                        board.update_is_under_Check(board.grid[king_position]) #type: ignore
+                else:
+                    # The move is not legal, Board.move raises the error telling why.
+                    board.move(movement)
+                legal_move_index = board.get_legal_move_index()
+                # make_move puts a new Piece on the final square, so the sprite has to follow it.
+                all_sprites.sprites[dragged_sprite_index].piece = board.grid[final_position]
                 initial_position = const.SENTINAL_POSITION
                 final_position = const.SENTINAL_POSITION
 
+                status: str = board.get_game_status()
+                if status != const.ONGOING:
+                    print(f"Game over: {status}.")
+                    pygame.display.set_caption(f"Chess - Game over: {status}")
+
                 for index, sprite in enumerate(all_sprites.sprites):
                     if sprite.piece in board.captured_pieces:
                         all_sprites.sprites.pop(index)
@@ -85,14 +105,30 @@ def main_gui(starting_fen: str):
             all_sprites.restore(backup_sprites)
             print(f"{const.RED}{e}{const.RESET}")
 
-        screen.blit(pygame.transform.scale(chess_board, (const.BOARD_HEIGHT, const.BOARD_HEIGHT)), chess_board_rect)
-        for sprite in all_sprites.sprites:
-            screen.blit(sprite.image, sprite.rect)
-        pygame.display.update()
+        highlighted_squares: set[tuple[int, int]] = legal_move_index.get(initial_position.position, set()) if dragging else set()
+        draw_frame(screen, chess_board, chess_board_rect, all_sprites, highlight, highlighted_squares)
 
     pygame.quit()
 
 
+def draw_frame(
+    screen: pygame.Surface,
+    chess_board: pygame.Surface,
+    chess_board_rect: pygame.Rect,
+    all_sprites: "AllSprites",
+    highlight: pygame.Surface,
+    highlighted_squares: set[tuple[int, int]]
+) -> None:
+    """Draws the board, the highlighted squares and the pieces, and updates the display."""
+
+    screen.blit(pygame.transform.scale(chess_board, (const.BOARD_HEIGHT, const.BOARD_HEIGHT)), chess_board_rect)
+    for rank, file in highlighted_squares:
+        screen.blit(highlight, (const.X_OFFSET + (file * const.GRID_BOX_SIZE), const.Y_OFFSET + (rank * const.GRID_BOX_SIZE)))
+    for sprite in all_sprites.sprites:
+        screen.blit(sprite.image, sprite.rect)
+    pygame.display.update()
+
+
 class PieceSprite(pygame.sprite.Sprite):
     def __init__(self, piece: Piece) -> None:
         super().__init__()
@@ -105,8 +141,10 @@ class PieceSprite(pygame.sprite.Sprite):
         self.rect.height = round(const.PIECE_HEIGHT * 0.8) if piece.name == const.PAWN else const.PIECE_HEIGHT
 
     def copy(self):
-        copy: PieceSprite = PieceSprite(self.piece)
-        copy.rect = self.rect.copy()
+        # Shares the already scaled image instead of scaling the icon again.
+        copy: PieceSprite = PieceSprite.__new__(PieceSprite)
+        pygame.sprite.Sprite.__init__(copy)
+        copy.piece, copy.image, copy.rect = self.piece, self.image, self.rect.copy()
         return copy
 
 
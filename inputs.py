@@ -37,3 +37,14 @@ def input_str_validator(input_str: str) -> bool:
     input_regex = r"([a-h][1-8])[ ]([a-h][1-8])"
     return bool(re.fullmatch(input_regex, input_str))
 
+
+def position_tuple_to_alg_notation(position: PositionTuple) -> str:
+    """Takes a PositionTuple and returns its algebraic notation in str, the inverse of alg_notation_to_position_tuple."""
+
+    return f"{chr(ord("a") + position.file)}{const.GRID_SIZE - position.rank}"
+
+
+def movement_tuple_to_input_str(movement: MovementTuple) -> str:
+    """Takes a MovementTuple and returns it in the same format as accepted by input_str_to_movement_tuple."""
+
+    return f"{position_tuple_to_alg_notation(movement.initial_position)} {position_tuple_to_alg_notation(movement.final_position)}"
@@ -1,13 +1,17 @@
 import argparse
+import sys
 
 import constants as const
-from cli import main_cli
-from gui import main_gui
 
 class Args:
     def __init__(self) -> None:
         self.cli: bool
+        self.batch: str | None
+        self.fen_output: bool
+        self.keep_going: bool
         self.fen: str
+        self.profile: bool
+        self.profile_output: str | None
 
 parser = argparse.ArgumentParser(
     prog="main.py"
@@ -15,15 +19,52 @@ parser = argparse.ArgumentParser(
 args = Args()
 parser.add_argument("fen",nargs="?", default=const.DEFAULT_FEN)
 parser.add_argument("-c", "--cli", action="store_true", help="Add this flag to run this program in cli.")
+parser.add_argument("-b", "--batch", default=None, help="Play the moves in this file (or '-' for stdin) in cli without rendering, then print the final board.")
+parser.add_argument("--fen-output", action="store_true", help="With --batch, print the final FEN string instead of the board.")
+parser.add_argument("--keep-going", action="store_true", help="With --batch, skip invalid moves instead of stopping at the first one.")
+parser.add_argument("--profile", action="store_true", help="Add this flag to count calls and time of the hot paths and print a report at exit.")
+parser.add_argument("--profile-output", default=None, help="With --profile, also write cProfile stats to this file (readable with pstats).")
 parser.parse_args(namespace=args)
 
 
 def main():
-    if args.cli:
+    # Only the interface in use is imported, so the CLI never pays for importing and initializing pygame.
+    if args.batch:
+        from cli import main_batch
+        if args.batch == "-":
+            exit_code: int = main_batch(args.fen, sys.stdin, args.fen_output, args.keep_going)
+        else:
+            with open(args.batch) as moves_file:
+                exit_code = main_batch(args.fen, moves_file, args.fen_output, args.keep_going)
+        sys.exit(exit_code)
+    elif args.cli:
+        from cli import main_cli
         main_cli(args.fen)
     else:
+        from gui import main_gui
         main_gui(args.fen)
 
 
+def main_with_profiling():
+    import cProfile
+    import profiler
+
+    profiler.enable()
+    profile = cProfile.Profile() if args.profile_output else None
+    try:
+        if profile:
+            profile.runcall(main)
+        else:
+            main()
+    finally:
+        profiler.disable()
+        if profile:
+            profile.dump_stats(args.profile_output)
+        print(profiler.report(), file=sys.stderr)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if args.profile:
+        main_with_profiling()
+    else:
+        main()
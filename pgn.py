@@ -0,0 +1,192 @@
+from typing import Iterable, Iterator
+import re
+
+import constants as const
+from board import Board
+from pieces import Piece
+from positions import PositionTuple, MovementTuple
+from inputs import position_tuple_to_alg_notation, alg_notation_to_position_tuple
+import errors
+
+
+RESULTS: list[str] = ["1-0", "0-1", "1/2-1/2", "*"]
+
+
+
+def movement_to_san(board: Board, movement: MovementTuple) -> str:
+    """Takes a legal move of the active color and returns it in Standard Algebraic Notation, e.g. 'Nbd2', 'exd5' or 'Qh5+'."""
+
+    piece: Piece = board.grid[movement.initial_position]
+    is_capture: bool = board.grid[movement.final_position].color != const.EMPTY
+    target: str = position_tuple_to_alg_notation(movement.final_position)
+    initial_square: str = position_tuple_to_alg_notation(movement.initial_position)
+
+    if piece.name == const.PAWN:
+        san: str = f"{initial_square[0]}x{target}" if is_capture else target
+    else:
+        # Other pieces of the same kind which can also move to the target square make the move ambiguous.
+        rivals: list[Piece] = [
+            board.grid[other.initial_position] for other in board.get_all_legal_moves()
+            if other.final_position == movement.final_position
+            and not other.initial_position == movement.initial_position
+            and board.grid[other.initial_position].name == piece.name
+        ]
+        disambiguation: str = ""
+        if rivals:
+            if all(rival.position.file != piece.position.file for rival in rivals):
+                disambiguation = initial_square[0]
+            elif all(rival.position.rank != piece.position.rank for rival in rivals):
+                disambiguation = initial_square[1]
+            else:
+                disambiguation = initial_square
+        notation: str = const.symbol_notation_and_material[const.NOTATION][const.WHITE][piece.name]
+        san = f"{notation}{disambiguation}{'x' if is_capture else ''}{target}"
+
+    board.make_move(movement)
+    if board.is_king_under_Check(board.active_color):
+        san += "+" if board.has_legal_move() else "#"
+    board.unmake_move()
+    return san
+
+
+def game_to_pgn(headers: dict[str, str], sans: list[str], result: str, starting_fen: str = const.DEFAULT_FEN) -> str:
+    """
+    Returns one game in PGN format.
+
+    Args:
+        headers: Tag pairs written before the standard Result and FEN tags, e.g. Event, White and Black.
+        sans: Moves of the game in Standard Algebraic Notation.
+        result: '1-0', '0-1', '1/2-1/2' or '*'.
+        starting_fen: FEN of the position the game started from.
+    """
+    tags: dict[str, str] = {**headers, "Result": result}
+    if starting_fen != const.DEFAULT_FEN:
+        tags["SetUp"] = "1"
+        tags["FEN"] = starting_fen
+
+    starting_board = Board(starting_fen)
+    move_number: int = starting_board.fullmove_count
+    color: int = starting_board.active_color
+
+    tokens: list[str] = []
+    for san in sans:
+        if color == const.WHITE:
+            tokens.append(f"{move_number}.")
+        elif not tokens:
+            tokens.append(f"{move_number}...")
+        tokens.append(san)
+        if color == const.BLACK:
+            move_number += 1
+        color = (color + 1) % 2
+    tokens.append(result)
+
+    lines: list[str] = [f'[{name} "{value}"]' for name, value in tags.items()]
+    lines.append("")
+
+    # Movetext lines are wrapped at 80 characters as recommended by the PGN standard.
+    line: str = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > 80:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def san_to_movement(board: Board, san: str) -> MovementTuple:
+    """Takes a move of the active color in Standard Algebraic Notation and returns its MovementTuple, raising InvalidMove if it is not legal."""
+
+    match: re.Match | None = re.fullmatch(r"([KQRBN])?([a-h])?([1-8])?x?([a-h][1-8])[+#]?[!?]*", san)
+    if not match:
+        raise errors.InvalidMove
+    notation, from_file, from_rank, target = match.groups()
+
+    name: str = const.PAWN
+    for piece_name, piece_notation in const.symbol_notation_and_material[const.NOTATION][const.WHITE].items():
+        if piece_notation == notation:
+            name = piece_name
+    final_position: PositionTuple = alg_notation_to_position_tuple(target)
+
+    # Only the few pieces which can reach the target square are tested for leaving the King under Check.
+    candidates: list[MovementTuple] = []
+    for row in board.grid.array:
+        for piece in row:
+            if piece.color != board.active_color or piece.name != name:
+                continue
+            initial_square: str = position_tuple_to_alg_notation(piece.position)
+            if (from_file and initial_square[0] != from_file) or (from_rank and initial_square[1] != from_rank):
+                continue
+            if final_position not in board.get_legal_moves(piece):
+                continue
+            movement = MovementTuple((piece.position, final_position))
+            board.make_move(movement)
+            if not board.is_king_under_Check(piece.color):
+                candidates.append(movement)
+            board.unmake_move()
+
+    if len(candidates) != 1:
+        raise errors.InvalidMove
+    return candidates[0]
+
+
+def play_sans(board: Board, sans: list[str]) -> Iterator[MovementTuple]:
+    """
+    Yields the MovementTuple of every move in turn, with board still in the position before the move, and makes the
+    move on board when the next one is requested.
+
+    Stops before the first move which is not legal or not supported by Board, castling and promotion included, so a
+    caller gets the legal prefix of the game and can tell it was cut short by counting the moves yielded.
+    """
+    for san in sans:
+        try:
+            movement: MovementTuple = san_to_movement(board, san)
+        except errors.InvalidMove:
+            return
+        yield movement
+        board.make_move(movement)
+
+
+def read_games(lines: Iterable[str]) -> Iterator[tuple[dict[str, str], list[str], str]]:
+    """
+    Reads games in PGN format, skipping comments, variations and NAGs.
+
+    Yields:
+        game: Tuple of (tag pairs, moves in Standard Algebraic Notation, result).
+    """
+    headers: dict[str, str] = {}
+    movetext: list[str] = []
+
+    for line in lines:
+        line = line.strip()
+        tag: re.Match | None = re.fullmatch(r'\[(\w+)\s+"(.*)"\]', line)
+        if tag:
+            if movetext:
+                yield headers, *parse_movetext("\n".join(movetext))
+                headers, movetext = {}, []
+            headers[tag.group(1)] = tag.group(2)
+        elif line and not line.startswith("%"):
+            movetext.append(line)
+
+    if headers or movetext:
+        yield headers, *parse_movetext("\n".join(movetext))
+
+
+def parse_movetext(movetext: str) -> tuple[list[str], str]:
+    """Returns the moves and the result from the movetext of one game."""
+
+    movetext = re.sub(r"\{[^}]*\}|;[^\n]*", " ", movetext)
+    while re.search(r"\([^()]*\)", movetext):
+        movetext = re.sub(r"\([^()]*\)", " ", movetext)
+
+    sans: list[str] = []
+    result: str = "*"
+    for token in movetext.split():
+        if token in RESULTS:
+            result = token
+            break
+        token = re.sub(r"^\d+\.+", "", token)
+        if token and not token.startswith("$"):
+            sans.append(token)
+    return sans, result
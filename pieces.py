@@ -1,8 +1,15 @@
-import pygame
+from __future__ import annotations
+from typing import TYPE_CHECKING
 
 import constants as const
 from positions import PositionTuple
 
+if TYPE_CHECKING:
+    import pygame
+
+
+# Icons are shared by every piece of the same name and color, so each image is loaded once per process.
+icon_cache: dict[tuple[str, int], pygame.Surface] = {}
 
 
 class Piece:
@@ -31,7 +38,28 @@ class Piece:
         self.can_slide: bool
         self.directions_to_get_possible_moves: list[str]
         self.values_to_calculate_possible_moves: list[PositionTuple]
-        self.icon: pygame.Surface
+
+
+    def moved_to(self, position: PositionTuple) -> Piece:
+        """Returns a copy of the piece standing on position and marked as moved, leaving this piece unchanged."""
+
+        piece: Piece = object.__new__(type(self))
+        piece.__dict__.update(self.__dict__)
+        piece.position, piece.is_moved = position, True
+        return piece
+
+
+    @property
+    def icon(self) -> pygame.Surface:
+        """Icon used to display the piece in the GUI, loaded on first use and shared by all pieces of the same kind."""
+
+        key: tuple[str, int] = (self.name, self.color)
+        if key not in icon_cache:
+            # pygame is only needed by the GUI, importing it here keeps it off the CLI and scripted paths.
+            import pygame
+            color_name: str = "white" if self.color == const.WHITE else "black"
+            icon_cache[key] = pygame.image.load(f"assets/{self.name.lower()}_{color_name}.png")
+        return icon_cache[key]
 
 
 class Empty(Piece):
@@ -65,7 +93,6 @@ class King(Piece):
         super().__init__(color, position)
         self.symbol = const.symbol_notation_and_material[const.SYMBOL][color][King.name]
         self.is_under_Check: bool = False
-        self.icon = pygame.image.load("assets/king_white.png") if color == const.WHITE else pygame.image.load("assets/king_black.png")
 
 
     def pieces_to_get_possible_attacking_squares(self) -> list[Piece]:
@@ -97,7 +124,6 @@ class Queen(Piece):
     def __init__(self, color: int, position: PositionTuple):
         super().__init__(color, position)
         self.symbol = const.symbol_notation_and_material[const.SYMBOL][color][Queen.name]
-        self.icon = pygame.image.load("assets/queen_white.png") if color == const.WHITE else pygame.image.load("assets/queen_black.png")
 
 
 class Rook(Piece):
@@ -110,7 +136,6 @@ class Rook(Piece):
     def __init__(self, color: int, position: PositionTuple):
         super().__init__(color, position)
         self.symbol = const.symbol_notation_and_material[const.SYMBOL][color][Rook.name]
-        self.icon = pygame.image.load("assets/rook_white.png") if color == const.WHITE else pygame.image.load("assets/rook_black.png")
 
 
 class Bishop(Piece):
@@ -123,7 +148,6 @@ class Bishop(Piece):
     def __init__(self, color: int, position: PositionTuple):
         super().__init__(color, position)
         self.symbol = const.symbol_notation_and_material[const.SYMBOL][color][Bishop.name]
-        self.icon = pygame.image.load("assets/bishop_white.png") if color == const.WHITE else pygame.image.load("assets/bishop_black.png")
 
 
 class Knight(Piece):
@@ -145,73 +169,43 @@ class Knight(Piece):
     def __init__(self, color: int, position: PositionTuple):
         super().__init__(color, position)
         self.symbol = const.symbol_notation_and_material[const.SYMBOL][color][Knight.name]
-        self.icon = pygame.image.load("assets/knight_white.png") if color == const.WHITE else pygame.image.load("assets/knight_black.png")
 
 
 class Pawn(Piece):
     name: str = const.PAWN
     material: int = const.symbol_notation_and_material[const.MATERIAL][name]
     can_slide: bool = False
+    # Indexed by color, shared by every pawn of that color.
+    values_to_calculate_possible_moves_by_color: list[list[PositionTuple]] = [
+        [PositionTuple((-1, 0)), PositionTuple((-2, 0))],
+        [PositionTuple((1, 0)), PositionTuple((2, 0))]
+    ]
+    values_to_calculate_possible_captures_by_color: list[list[PositionTuple]] = [
+        [PositionTuple((-1, 1)), PositionTuple((-1, -1))],
+        [PositionTuple((1, 1)), PositionTuple((1, -1))]
+    ]
+    starting_rank: list[int] = [const.GRID_SIZE - 2, 1]
 
 
     def __init__(self, color: int, position: PositionTuple):
         super().__init__(color, position)
         self.symbol = const.symbol_notation_and_material[const.SYMBOL][color][Pawn.name]
-        self.values_to_calculate_possible_moves: list[PositionTuple] = [
-            PositionTuple((-1, 0)),
-            PositionTuple((-2, 0))
-        ] if color == const.WHITE else [
-            PositionTuple((1, 0)),
-            PositionTuple((2, 0))
-        ]
-        self.values_to_calculate_possible_captures: list[PositionTuple] = [
-            PositionTuple((-1, 1)),
-            PositionTuple((-1, -1))
-        ] if color == const.WHITE else [
-            PositionTuple((1, 1)),
-            PositionTuple((1, -1))
-        ]
-        self.icon = pygame.image.load("assets/pawn_white.png") if color == const.WHITE else pygame.image.load("assets/pawn_black.png")
+        self.values_to_calculate_possible_moves: list[PositionTuple] = Pawn.values_to_calculate_possible_moves_by_color[color]
+        self.values_to_calculate_possible_captures: list[PositionTuple] = Pawn.values_to_calculate_possible_captures_by_color[color]
+
+
+# Notation of every piece to its class, both colors share the class.
+piece_classes: dict[str, type[Piece]] = {
+    const.symbol_notation_and_material[const.NOTATION][color][piece_class.name]: piece_class
+    for color in [const.WHITE, const.BLACK]
+    for piece_class in [King, Queen, Rook, Bishop, Knight, Pawn]
+}
 
 
 def create_piece(notation: str, position: PositionTuple) -> Piece:
     """Takes the notation and position as argument and creates a Piece according to it."""
 
-    if notation in [
-        const.symbol_notation_and_material[const.NOTATION][const.WHITE][const.KING],
-        const.symbol_notation_and_material[const.NOTATION][const.BLACK][const.KING]
-        ]:
-        return King(const.WHITE if notation.isupper() else const.BLACK, position)
-    
-    elif notation in [
-        const.symbol_notation_and_material[const.NOTATION][const.WHITE][const.QUEEN],
-        const.symbol_notation_and_material[const.NOTATION][const.BLACK][const.QUEEN]
-        ]:
-        return Queen(const.WHITE if notation.isupper() else const.BLACK, position)
-    
-    elif notation in [
-        const.symbol_notation_and_material[const.NOTATION][const.WHITE][const.ROOK],
-        const.symbol_notation_and_material[const.NOTATION][const.BLACK][const.ROOK]
-        ]:
-        return Rook(const.WHITE if notation.isupper() else const.BLACK, position)
-    
-    elif notation in [
-        const.symbol_notation_and_material[const.NOTATION][const.WHITE][const.BISHOP],
-        const.symbol_notation_and_material[const.NOTATION][const.BLACK][const.BISHOP]
-        ]:
-        return Bishop(const.WHITE if notation.isupper() else const.BLACK, position)
-    
-    elif notation in [
-        const.symbol_notation_and_material[const.NOTATION][const.WHITE][const.KNIGHT],
-        const.symbol_notation_and_material[const.NOTATION][const.BLACK][const.KNIGHT]
-        ]:
-        return Knight(const.WHITE if notation.isupper() else const.BLACK, position)
-    
-    elif notation in [
-        const.symbol_notation_and_material[const.NOTATION][const.WHITE][const.PAWN],
-        const.symbol_notation_and_material[const.NOTATION][const.BLACK][const.PAWN]
-        ]:
-        return Pawn(const.WHITE if notation.isupper() else const.BLACK, position)
-    
-    else:
+    piece_class: type[Piece] | None = piece_classes.get(notation)
+    if piece_class is None:
         return Empty(const.EMPTY, position)
+    return piece_class(const.WHITE if notation.isupper() else const.BLACK, position)
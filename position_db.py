@@ -0,0 +1,189 @@
+import argparse
+import sqlite3
+import sys
+import time
+from typing import Iterable, Iterator
+
+import constants as const
+from board import Board
+from positions import MovementTuple
+from inputs import movement_tuple_to_input_str
+from pgn import read_games, play_sans
+import errors
+
+
+
+class PositionDatabase:
+    """
+    SQLite index of the positions reached in a collection of games.
+
+    Every row is one move played from one position, keyed by the Zobrist hash of the position (Board.hash), with how
+    often it was played and the results of those games. Looking up every continuation of a position is a single
+    primary key range scan.
+
+    Args:
+        path: Path of the SQLite database file, created if it does not exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS continuations ("
+            "hash INTEGER NOT NULL, move TEXT NOT NULL, "
+            "count INTEGER NOT NULL, white_wins INTEGER NOT NULL, draws INTEGER NOT NULL, black_wins INTEGER NOT NULL, "
+            "PRIMARY KEY (hash, move)) WITHOUT ROWID"
+        )
+        self.connection.commit()
+
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+    def add_games(self, games: Iterable[tuple[str, list[MovementTuple], str]]) -> int:
+        """
+        Adds games to the index, POSITION_DB_BATCH_SIZE games per transaction.
+
+        Args:
+            games: Iterable of (starting FEN, moves, result) where result is '1-0', '0-1', '1/2-1/2' or '*'.
+
+        Returns:
+            count: Number of games added.
+        """
+        # (hash, move) -> [count, white_wins, draws, black_wins], summed in memory and written once per batch.
+        batch: dict[tuple[int, str], list[int]] = {}
+        batch_games: int = 0
+        count: int = 0
+
+        for starting_fen, movements, result in games:
+            outcome: list[int] = [1, result == "1-0", result == "1/2-1/2", result == "0-1"]
+            board = Board(starting_fen)
+            for movement in movements:
+                totals: list[int] = batch.setdefault((to_signed_64(board.hash), movement_tuple_to_input_str(movement)), [0, 0, 0, 0])
+                for index, value in enumerate(outcome):
+                    totals[index] += value
+                board.make_move(movement)
+
+            batch_games += 1
+            count += 1
+            if batch_games >= const.POSITION_DB_BATCH_SIZE:
+                self.write_batch(batch)
+                batch, batch_games = {}, 0
+
+        self.write_batch(batch)
+        return count
+
+
+    def write_batch(self, batch: dict[tuple[int, str], list[int]]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO continuations VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (hash, move) DO UPDATE SET "
+                "count = count + excluded.count, white_wins = white_wins + excluded.white_wins, "
+                "draws = draws + excluded.draws, black_wins = black_wins + excluded.black_wins",
+                [(position_hash, move, *totals) for (position_hash, move), totals in batch.items()]
+            )
+
+
+    def continuations(self, board: Board) -> list[tuple[str, int, int, int, int]]:
+        """Returns (move, count, white_wins, draws, black_wins) of every move played from the position on board, most played first."""
+
+        return self.connection.execute(
+            "SELECT move, count, white_wins, draws, black_wins FROM continuations WHERE hash = ? ORDER BY count DESC",
+            (to_signed_64(board.hash),)
+        ).fetchall()
+
+
+def to_signed_64(value: int) -> int:
+    """Maps an unsigned 64 bit hash to the signed range stored by SQLite INTEGER columns."""
+
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+class PgnGames:
+    """
+    Iterates over (starting FEN, moves, result) of every game in PGN files.
+
+    A game is cut before its first move which is not legal or not supported by Board (castling and promotion), and
+    the moves before it are still yielded.
+
+    Args:
+        paths: Paths of the PGN files.
+
+    Attributes:
+        truncated: Number of games cut before their last move.
+        unreadable: Number of games skipped because of an invalid starting FEN.
+    """
+
+    def __init__(self, paths: list[str]) -> None:
+        self.paths: list[str] = paths
+        self.truncated: int = 0
+        self.unreadable: int = 0
+
+
+    def __iter__(self) -> Iterator[tuple[str, list[MovementTuple], str]]:
+        for path in self.paths:
+            with open(path) as file:
+                for headers, sans, result in read_games(file):
+                    starting_fen: str = headers.get("FEN", const.DEFAULT_FEN)
+                    try:
+                        board = Board(starting_fen)
+                    except errors.InvalidFEN:
+                        self.unreadable += 1
+                        continue
+                    movements: list[MovementTuple] = list(play_sans(board, sans))
+                    if len(movements) < len(sans):
+                        self.truncated += 1
+                    yield starting_fen, movements, result
+
+
+class Args:
+    def __init__(self) -> None:
+        self.command: str
+        self.database: str
+        self.pgn: list[str]
+        self.fen: str
+
+
+def main_position_db() -> None:
+    parser = argparse.ArgumentParser(
+        prog="position_db.py"
+    )
+    args = Args()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = subparsers.add_parser("ingest", help="Add the games of PGN files to the database.")
+    ingest_parser.add_argument("database")
+    ingest_parser.add_argument("pgn", nargs="+")
+    query_parser = subparsers.add_parser("query", help="List the moves played from a position.")
+    query_parser.add_argument("database")
+    query_parser.add_argument("fen", nargs="?", default=const.DEFAULT_FEN)
+    parser.parse_args(namespace=args)
+
+    database = PositionDatabase(args.database)
+    if args.command == "ingest":
+        games = PgnGames(args.pgn)
+        start: float = time.perf_counter()
+        count: int = database.add_games(games)
+        print(
+            f"Added {count} games in {time.perf_counter() - start:.1f}s, {games.truncated} of them up to an unsupported "
+            f"or illegal move, skipped {games.unreadable} games with an invalid starting FEN."
+        )
+    else:
+        try:
+            board = Board(args.fen)
+        except errors.InvalidFEN:
+            print("Invalid FEN string passed.")
+            sys.exit(1)
+        start: float = time.perf_counter()
+        rows: list[tuple[str, int, int, int, int]] = database.continuations(board)
+        elapsed: float = time.perf_counter() - start
+        for move, count, white_wins, draws, black_wins in rows:
+            print(f"{move}  {count:>8}  +{white_wins} ={draws} -{black_wins}")
+        print(f"{len(rows)} moves in {elapsed * 1000:.2f}ms")
+    database.close()
+
+
+if __name__ == "__main__":
+    main_position_db()
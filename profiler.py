@@ -0,0 +1,113 @@
+import functools
+import time
+from typing import Any, Callable
+
+
+
+class FunctionStats:
+    """
+    Call count and cumulative time of one instrumented function, in total and per piece type.
+
+    Attributes:
+        calls: Number of calls.
+        total_time: Cumulative time spent in the function, including nested calls, in seconds.
+        per_piece: Dictionary of piece name to [calls, total_time].
+    """
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.total_time: float = 0.0
+        self.per_piece: dict[str, list[Any]] = {}
+
+
+    def record(self, piece_name: str | None, elapsed: float) -> None:
+        self.calls += 1
+        self.total_time += elapsed
+        if piece_name is not None:
+            piece_stats: list[Any] = self.per_piece.setdefault(piece_name, [0, 0.0])
+            piece_stats[0] += 1
+            piece_stats[1] += elapsed
+
+
+# Name of each instrumented function to its FunctionStats, filled only while instrumentation is enabled.
+stats: dict[str, FunctionStats] = {}
+
+# (owner, attribute name, original function) of every function replaced by enable(), used by disable().
+originals: list[tuple[Any, str, Callable]] = []
+
+
+def hot_paths() -> list[tuple[Any, str, Callable[..., str] | None]]:
+    """
+    Returns the hot paths to instrument.
+
+    Returns:
+        hot_paths: List of (owner, attribute name, function taking the same arguments and returning the piece name or None).
+    """
+    import fen
+    from board import Board
+
+    return [
+        (Board, "get_legal_moves", lambda board, piece: piece.name),
+        (Board, "attacked_by_square", lambda board, attacked_square, attacked_by_square: board.grid[attacked_by_square].name),
+        (Board, "is_king_under_Check", None),
+        (Board, "update_is_under_Check", None),
+        (Board, "make_move", lambda board, movement: board.grid[movement.initial_position].name),
+        (Board, "move", lambda board, movement: board.grid[movement.initial_position].name),
+        (fen, "fen_parser", None),
+    ]
+
+
+def instrument(name: str, function: Callable, get_piece_name: Callable[..., str] | None) -> Callable:
+    """Returns function wrapped to record its calls and time in stats[name]."""
+
+    function_stats: FunctionStats = stats.setdefault(name, FunctionStats())
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        piece_name: str | None = get_piece_name(*args, **kwargs) if get_piece_name else None
+        start: float = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            function_stats.record(piece_name, perf_counter() - start)
+
+    return wrapper
+
+
+def enable() -> None:
+    """
+    Replaces the hot paths with instrumented versions.
+
+    Nothing is wrapped until this is called, so the hot paths cost nothing extra while instrumentation is disabled.
+    """
+    if originals:
+        return
+    for owner, attribute, get_piece_name in hot_paths():
+        function: Callable = getattr(owner, attribute)
+        originals.append((owner, attribute, function))
+        setattr(owner, attribute, instrument(f"{owner.__name__}.{attribute}", function, get_piece_name))
+
+
+def disable() -> None:
+    """Restores the original hot paths, keeping the stats recorded so far."""
+
+    while originals:
+        owner, attribute, function = originals.pop()
+        setattr(owner, attribute, function)
+
+
+def report() -> str:
+    """Returns a table of calls and cumulative time per instrumented function and per piece type."""
+
+    lines: list[str] = [f"{'function':<32}{'piece':<10}{'calls':>12}{'total (s)':>14}{'per call (us)':>16}"]
+    for name, function_stats in sorted(stats.items(), key=lambda item: item[1].total_time, reverse=True):
+        if not function_stats.calls:
+            continue
+        lines.append(
+            f"{name:<32}{'':<10}{function_stats.calls:>12}{function_stats.total_time:>14.4f}"
+            f"{function_stats.total_time / function_stats.calls * 1e6:>16.2f}"
+        )
+        for piece_name, (calls, total_time) in sorted(function_stats.per_piece.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(f"{'':<32}{piece_name:<10}{calls:>12}{total_time:>14.4f}{total_time / calls * 1e6:>16.2f}")
+    return "\n".join(lines)
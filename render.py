@@ -0,0 +1,153 @@
+import argparse
+import multiprocessing
+import os
+import time
+from typing import Any
+
+# Rendering needs no window, SDL's dummy video driver works without a display.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+# SDL turns SIGTERM into a quit event by default, which would keep the pool from terminating its workers.
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+import constants as const
+import fen
+
+ASSETS_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+
+
+class SpriteAtlas:
+    """
+    The board and every piece icon, loaded from the assets once and pre-scaled to the square size.
+
+    All twelve icons are packed side by side into one Surface, and a piece is drawn by blitting its area of the atlas,
+    so rendering a board never loads or scales an image.
+
+    Args:
+        square_size: Size of a square of the rendered board in pixels.
+
+    Attributes:
+        board: Empty board scaled so its squares are square_size pixels.
+        atlas: Surface holding the scaled icons.
+        areas: Area of the atlas of every piece, keyed by its notation.
+        origin: Pixel position of the top left square on the board.
+        padding: Offset of an icon inside its square, to center it.
+    """
+
+    def __init__(self, square_size: int) -> None:
+        scale: float = square_size / const.GRID_BOX_SIZE
+        board_size: int = round(const.BOARD_HEIGHT * scale)
+        icon_size: int = round(const.PIECE_HEIGHT * scale)
+
+        self.square_size: int = square_size
+        self.origin: tuple[int, int] = (round(const.X_OFFSET * scale), round(const.Y_OFFSET * scale))
+        self.padding: int = (square_size - icon_size) // 2
+        self.board: pygame.Surface = pygame.transform.smoothscale(
+            pygame.image.load(os.path.join(ASSETS_PATH, "chess_board.png")).convert(), (board_size, board_size)
+        )
+
+        notations: list[dict[str, str]] = const.symbol_notation_and_material[const.NOTATION]
+        pieces: list[tuple[int, str]] = [
+            (color, name)
+            for color in [const.WHITE, const.BLACK]
+            for name in [const.KING, const.QUEEN, const.ROOK, const.BISHOP, const.KNIGHT, const.PAWN]
+        ]
+        self.atlas: pygame.Surface = pygame.Surface((icon_size * len(pieces), icon_size), pygame.SRCALPHA)
+        self.areas: dict[str, pygame.Rect] = {}
+        for index, (color, name) in enumerate(pieces):
+            color_name: str = "white" if color == const.WHITE else "black"
+            icon: pygame.Surface = pygame.image.load(os.path.join(ASSETS_PATH, f"{name.lower()}_{color_name}.png")).convert_alpha()
+            area = pygame.Rect(index * icon_size, 0, icon_size, icon_size)
+            self.atlas.blit(pygame.transform.smoothscale(icon, area.size), area)
+            self.areas[notations[color][name]] = area
+
+
+    def render(self, piece_placement: list[str]) -> pygame.Surface:
+        """Returns the image of the board with the pieces of the modified FEN piece placement, one string per rank."""
+
+        image: pygame.Surface = self.board.copy()
+        x_origin, y_origin = self.origin
+        image.blits([
+            (
+                self.atlas,
+                (x_origin + file * self.square_size + self.padding, y_origin + rank * self.square_size + self.padding),
+                self.areas[notation]
+            )
+            for rank, row in enumerate(piece_placement)
+            for file, notation in enumerate(row)
+            if notation in self.areas
+        ], doreturn=False)
+        return image
+
+
+# Atlas of the worker process, built once by init_worker.
+atlas: SpriteAtlas | None = None
+
+
+def init_worker(square_size: int) -> None:
+    global atlas
+    pygame.display.init()
+    # convert() and convert_alpha() need a display mode, even with the dummy driver.
+    pygame.display.set_mode((1, 1))
+    atlas = SpriteAtlas(square_size)
+
+
+def render_fen(task: tuple[int, str, str]) -> bool:
+    """Renders one FEN to a PNG file in a worker process, returns False if the FEN is not valid."""
+
+    index, fen_string, output_directory = task
+    FEN_data: dict[str, Any] | None = fen.fen_parser(fen_string)
+    if not FEN_data:
+        return False
+    pygame.image.save(atlas.render(FEN_data["piece_placement_data"]), os.path.join(output_directory, f"{index:05}.png")) #type: ignore
+    return True
+
+
+def render_all(fen_strings: list[str], output_directory: str, square_size: int, workers: int) -> tuple[int, int]:
+    """
+    Renders every FEN to output_directory/<index of the FEN>.png across worker processes.
+
+    Returns:
+        counts: Tuple of (images written, invalid FEN strings skipped).
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    tasks: list[tuple[int, str, str]] = [(index, fen_string, output_directory) for index, fen_string in enumerate(fen_strings)]
+    written: int = 0
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(square_size,)) as pool:
+        for is_written in pool.imap_unordered(render_fen, tasks, chunksize=16):
+            written += is_written
+    return written, len(fen_strings) - written
+
+
+class Args:
+    def __init__(self) -> None:
+        self.fens: str
+        self.output: str
+        self.square_size: int
+        self.workers: int
+
+
+def main_render() -> None:
+    parser = argparse.ArgumentParser(
+        prog="render.py"
+    )
+    args = Args()
+    parser.add_argument("fens", help="File with one FEN per line.")
+    parser.add_argument("-o", "--output", default="diagrams", help="Directory the PNG images are written to.")
+    parser.add_argument("-s", "--square-size", type=int, default=const.GRID_BOX_SIZE, help="Size of a square in pixels.")
+    parser.add_argument("-w", "--workers", type=int, default=multiprocessing.cpu_count())
+    parser.parse_args(namespace=args)
+
+    with open(args.fens) as file:
+        fen_strings: list[str] = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+    start: float = time.perf_counter()
+    written, skipped = render_all(fen_strings, args.output, args.square_size, args.workers)
+    elapsed: float = time.perf_counter() - start
+    print(f"Rendered {written} images to {args.output} in {elapsed:.1f}s ({written / elapsed:.1f} images/s), skipped {skipped} invalid FEN strings.")
+
+
+if __name__ == "__main__":
+    main_render()
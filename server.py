@@ -0,0 +1,278 @@
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from typing import Any
+
+import constants as const
+from board import Board, PackedBoard
+from inputs import input_str_to_movement_tuple, movement_tuple_to_input_str
+import errors
+
+
+
+class Session:
+    """
+    Create a Session for one game hosted by the server.
+
+    Only the packed state of the game and the hashes of the positions since the last capture or Pawn move are kept
+    between requests, a Board is rebuilt from them whenever the session is used. This keeps an idle session down to a
+    few hundred bytes while repetitions are still detected.
+
+    Args:
+        board: Board in the state the game starts from.
+
+    Attributes:
+        packed: State of the game returned by Board.pack.
+        position_history: Hashes of the positions since the last capture or Pawn move, the current one last.
+        last_used: Value of time.monotonic() when the session was last used.
+    """
+
+    __slots__ = ("packed", "position_history", "last_used")
+
+    def __init__(self, board: Board) -> None:
+        self.packed: PackedBoard = board.pack()
+        self.position_history: list[int] = [board.hash]
+        self.last_used: float = time.monotonic()
+
+
+    def board(self) -> Board:
+        return Board.from_packed(self.packed, self.position_history)
+
+
+    def save(self, board: Board) -> None:
+        """Keeps the state of board, with only the positions which can still repeat."""
+
+        self.packed = board.pack()
+        self.position_history = board.position_history[-(board.halfmove_count + 1):]
+
+
+
+class Stats:
+    """
+    Throughput and latency counters of the server.
+
+    Attributes:
+        started_at: Value of time.monotonic() when the server was created.
+        requests: Number of requests handled.
+        failed_requests: Number of requests which returned an error.
+        total_latency: Sum of the time taken to handle every request, in seconds.
+        max_latency: Time taken by the slowest request, in seconds.
+        sessions_created: Number of sessions created.
+        sessions_evicted: Number of sessions removed for being idle.
+    """
+
+    def __init__(self) -> None:
+        self.started_at: float = time.monotonic()
+        self.requests: int = 0
+        self.failed_requests: int = 0
+        self.total_latency: float = 0.0
+        self.max_latency: float = 0.0
+        self.sessions_created: int = 0
+        self.sessions_evicted: int = 0
+
+
+    def record(self, latency: float, failed: bool) -> None:
+        self.requests += 1
+        self.failed_requests += failed
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+
+    def as_dict(self, active_sessions: int) -> dict[str, Any]:
+        uptime: float = time.monotonic() - self.started_at
+        return {
+            "uptime": uptime,
+            "active_sessions": active_sessions,
+            "sessions_created": self.sessions_created,
+            "sessions_evicted": self.sessions_evicted,
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "requests_per_second": self.requests / uptime if uptime else 0.0,
+            "average_latency": self.total_latency / self.requests if self.requests else 0.0,
+            "max_latency": self.max_latency
+        }
+
+
+
+class GameServer:
+    """
+    Hosts many games at once over a line based JSON protocol.
+
+    Every request is one JSON object on its own line with an "op" key, and gets one JSON object line back with "ok" set
+    to true or false. Supported ops are:
+        create: {"fen": optional FEN} -> {"session": id}
+        move: {"session": id, "move": "e2 e4"} -> {"fen": FEN after the move, "status": status of the game}
+        legal_moves: {"session": id} -> {"moves": ["e2 e4", ...]}
+        fen: {"session": id} -> {"fen": FEN}
+        close: {"session": id} -> {}
+        stats: {} -> counters from Stats
+
+    Args:
+        idle_timeout: Seconds after which an unused session is evicted.
+        max_sessions: Maximum number of sessions alive at once.
+    """
+
+    def __init__(self, idle_timeout: float = const.SESSION_IDLE_TIMEOUT, max_sessions: int = const.MAX_SESSIONS) -> None:
+        self.idle_timeout: float = idle_timeout
+        self.max_sessions: int = max_sessions
+        self.sessions: dict[int, Session] = {}
+        self.session_ids = itertools.count(1)
+        self.stats: Stats = Stats()
+
+
+    def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Handles one decoded request and returns the response to send back."""
+
+        op: Any = request.get("op")
+
+        if op == "create":
+            fen_string: str = request.get("fen", const.DEFAULT_FEN)
+            if not isinstance(fen_string, str):
+                raise errors.InvalidFEN
+            board = Board(fen_string)
+            if len(self.sessions) >= self.max_sessions:
+                self.evict_idle_sessions()
+                if len(self.sessions) >= self.max_sessions:
+                    raise errors.InvalidRequest
+            session_id: int = next(self.session_ids)
+            self.sessions[session_id] = Session(board)
+            self.stats.sessions_created += 1
+            return {"session": session_id}
+
+        if op == "stats":
+            return self.stats.as_dict(len(self.sessions))
+
+        session: Session = self.get_session(request.get("session"))
+
+        if op == "move":
+            board = session.board()
+            move_str: Any = request.get("move")
+            if not isinstance(move_str, str):
+                raise errors.InvalidInput
+            board.move(input_str_to_movement_tuple(move_str))
+            session.save(board)
+            return {"fen": board.to_fen(), "status": board.get_game_status()}
+        if op == "legal_moves":
+            board = session.board()
+            return {"moves": [movement_tuple_to_input_str(movement) for movement in board.get_all_legal_moves()]}
+        if op == "fen":
+            return {"fen": session.board().to_fen()}
+        if op == "close":
+            del self.sessions[request["session"]]
+            return {}
+
+        raise errors.InvalidRequest
+
+
+    def get_session(self, session_id: Any) -> Session:
+        """Returns the session with the given id and marks it as used."""
+
+        # bool is a subclass of int, so true and false would otherwise be sessions 1 and 0.
+        is_session_id: bool = isinstance(session_id, int) and not isinstance(session_id, bool)
+        session: Session | None = self.sessions.get(session_id) if is_session_id else None
+        if session is None:
+            raise errors.SessionNotFound
+        session.last_used = time.monotonic()
+        return session
+
+
+    def evict_idle_sessions(self) -> int:
+        """Removes every session unused for longer than idle_timeout and returns how many were removed."""
+
+        deadline: float = time.monotonic() - self.idle_timeout
+        idle_session_ids: list[int] = [
+            session_id for session_id, session in self.sessions.items() if session.last_used < deadline
+        ]
+        for session_id in idle_session_ids:
+            del self.sessions[session_id]
+        self.stats.sessions_evicted += len(idle_session_ids)
+        return len(idle_session_ids)
+
+
+    def handle_line(self, line: bytes) -> bytes:
+        """Decodes a request line, handles it and returns the encoded response line."""
+
+        start: float = time.perf_counter()
+        response: dict[str, Any]
+        try:
+            request: Any = json.loads(line)
+            if not isinstance(request, dict):
+                raise errors.InvalidRequest
+            response = {"ok": True, **self.handle_request(request)}
+        except errors.CustomException as e:
+            response = {"ok": False, "error": str(e)}
+        except (ValueError, TypeError):
+            response = {"ok": False, "error": str(errors.InvalidRequest())}
+        except Exception:
+            # Any other error is a bug, it is answered like any failed request so the connection stays usable.
+            response = {"ok": False, "error": str(errors.InternalError())}
+        self.stats.record(time.perf_counter() - start, not response["ok"])
+        return json.dumps(response).encode() + b"\n"
+
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    writer.write(self.handle_line(line))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+    async def evict_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(const.SESSION_EVICTION_INTERVAL)
+            self.evict_idle_sessions()
+
+
+    async def serve(self, host: str, port: int, unix_socket_path: str | None = None) -> None:
+        """Serves on a Unix socket if unix_socket_path is given, else on TCP host:port, until cancelled."""
+
+        if unix_socket_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_socket_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+
+        eviction_task = asyncio.create_task(self.evict_periodically())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            eviction_task.cancel()
+
+
+class Args:
+    def __init__(self) -> None:
+        self.host: str
+        self.port: int
+        self.unix: str | None
+        self.idle_timeout: float
+        self.max_sessions: int
+
+
+def main_server() -> None:
+    parser = argparse.ArgumentParser(
+        prog="server.py"
+    )
+    args = Args()
+    parser.add_argument("--host", default=const.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=const.SERVER_PORT)
+    parser.add_argument("--unix", default=None, help="Path of a Unix socket to serve on instead of TCP.")
+    parser.add_argument("--idle-timeout", type=float, default=const.SESSION_IDLE_TIMEOUT, help="Seconds after which an unused session is evicted.")
+    parser.add_argument("--max-sessions", type=int, default=const.MAX_SESSIONS)
+    parser.parse_args(namespace=args)
+
+    game_server = GameServer(args.idle_timeout, args.max_sessions)
+    try:
+        asyncio.run(game_server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main_server()
@@ -0,0 +1,253 @@
+import argparse
+import math
+import multiprocessing
+import sys
+import time
+from typing import Any
+
+import constants as const
+from board import Board
+from engine import search
+from pgn import movement_to_san, game_to_pgn
+import errors
+import fen
+
+
+
+class PlayerLimits:
+    """
+    Search limits of one engine in the tournament.
+
+    Args:
+        name: Name written in the PGN.
+        max_depth: Maximum depth of every search.
+        time_limit: Seconds per move, None for no limit.
+        node_limit: Nodes per move, None for no limit.
+    """
+
+    def __init__(self, name: str, max_depth: int, time_limit: float | None, node_limit: int | None) -> None:
+        self.name: str = name
+        self.max_depth: int = max_depth
+        self.time_limit: float | None = time_limit
+        self.node_limit: int | None = node_limit
+
+
+    def __str__(self) -> str:
+        limits: list[str] = [f"depth {self.max_depth}"]
+        if self.time_limit is not None:
+            limits.append(f"{self.time_limit}s/move")
+        if self.node_limit is not None:
+            limits.append(f"{self.node_limit} nodes/move")
+        return f"{self.name} ({', '.join(limits)})"
+
+
+
+class GameResult:
+    """
+    Outcome of one self-play game, sent back from the worker process.
+
+    Attributes:
+        index: Index of the game in the tournament.
+        result: '1-0', '0-1' or '1/2-1/2'.
+        score_a: Points scored by engine A (1, 0.5 or 0).
+        termination: Game status which ended the game, or 'max plies'.
+        plies: Number of halfmoves played.
+        nodes: Nodes searched by both engines.
+        search_time: Seconds spent searching by both engines.
+        pgn: The game in PGN format.
+    """
+
+    def __init__(self, index: int, result: str, score_a: float, termination: str, plies: int, nodes: int, search_time: float, pgn: str) -> None:
+        self.index: int = index
+        self.result: str = result
+        self.score_a: float = score_a
+        self.termination: str = termination
+        self.plies: int = plies
+        self.nodes: int = nodes
+        self.search_time: float = search_time
+        self.pgn: str = pgn
+
+
+def play_game(task: tuple[int, str, bool, PlayerLimits, PlayerLimits, int]) -> GameResult:
+    """Plays one game between engine A and engine B from the starting FEN, in a worker process."""
+
+    index, starting_fen, a_is_white, player_a, player_b, max_plies = task
+    board = Board(starting_fen)
+    sans: list[str] = []
+    nodes: int = 0
+    search_time: float = 0.0
+
+    while True:
+        status: str = board.get_game_status()
+        if status != const.ONGOING:
+            break
+        if len(sans) >= max_plies:
+            status = "max plies"
+            break
+
+        player: PlayerLimits = player_a if (board.active_color == const.WHITE) == a_is_white else player_b
+        result = search(board, player.max_depth, player.time_limit, player.node_limit)
+        nodes += result.nodes
+        search_time += result.elapsed
+        sans.append(movement_to_san(board, result.best_move)) #type: ignore
+        board.make_move(result.best_move) #type: ignore
+
+    if status == const.CHECKMATE:
+        result_str: str = "0-1" if board.active_color == const.WHITE else "1-0"
+    else:
+        result_str = "1/2-1/2"
+    white_score: float = {"1-0": 1.0, "0-1": 0.0}.get(result_str, 0.5)
+
+    white, black = (player_a, player_b) if a_is_white else (player_b, player_a)
+    headers: dict[str, str] = {
+        "Event": "Self-play",
+        "Site": "?",
+        "Round": str(index + 1),
+        "White": str(white),
+        "Black": str(black)
+    }
+    return GameResult(
+        index,
+        result_str,
+        white_score if a_is_white else 1 - white_score,
+        status,
+        len(sans),
+        nodes,
+        search_time,
+        game_to_pgn(headers, sans, result_str, starting_fen)
+    )
+
+
+def load_openings(path: str) -> list[str]:
+    """Reads one FEN per line from the file, skipping blank lines and lines starting with '#'."""
+
+    openings: list[str] = []
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            FEN_data: dict[str, Any] | None = fen.fen_parser(line)
+            if not FEN_data or not fen.has_one_king_per_color(FEN_data):
+                raise errors.InvalidFEN
+            openings.append(line)
+    return openings
+
+
+def elo_difference(score: float) -> float:
+    """Returns the Elo difference matching the expected score, a fraction between 0 and 1."""
+
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def elo_estimate(wins: int, draws: int, losses: int) -> tuple[float, float] | None:
+    """Returns the Elo difference of the results and its 95% error margin, None if no game was played."""
+
+    games: int = wins + draws + losses
+    if games == 0:
+        return None
+    score: float = (wins + draws / 2) / games
+    variance: float = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    standard_error: float = math.sqrt(variance / games)
+    low: float = elo_difference(score - 1.96 * standard_error)
+    high: float = elo_difference(score + 1.96 * standard_error)
+    return elo_difference(score), (high - low) / 2
+
+
+def run_tournament(openings: list[str], games: int, workers: int, player_a: PlayerLimits, player_b: PlayerLimits, max_plies: int, output_path: str) -> None:
+    """Plays the games across a process pool, appending each game to the PGN file as soon as it finishes."""
+
+    if games < 1:
+        raise ValueError("A tournament needs at least one game.")
+
+    # Every opening is played twice in a row, with engine A on each side.
+    tasks: list[tuple[int, str, bool, PlayerLimits, PlayerLimits, int]] = [
+        (index, openings[(index // 2) % len(openings)], index % 2 == 0, player_a, player_b, max_plies)
+        for index in range(games)
+    ]
+
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    nodes: int = 0
+    search_time: float = 0.0
+    start: float = time.perf_counter()
+
+    with open(output_path, "w") as output, multiprocessing.Pool(workers) as pool:
+        for game in pool.imap_unordered(play_game, tasks):
+            output.write(game.pgn + "\n")
+            output.flush()
+
+            wins += game.score_a == 1
+            draws += game.score_a == 0.5
+            losses += game.score_a == 0
+            nodes += game.nodes
+            search_time += game.search_time
+            print(f"Game {game.index + 1}: {game.result} ({game.termination}, {game.plies} plies)  A: +{wins} ={draws} -{losses}")
+
+    elapsed: float = time.perf_counter() - start
+    completed: int = wins + draws + losses
+    print(f"Games: {completed} in {elapsed:.1f}s ({completed / elapsed:.2f} games/s)")
+    print(f"Average nps: {nodes / search_time if search_time else 0:.0f}")
+    print(f"Score of {player_a} vs {player_b}: +{wins} ={draws} -{losses}")
+    estimate: tuple[float, float] | None = elo_estimate(wins, draws, losses)
+    if estimate is None:
+        print("Elo difference: no games completed")
+    else:
+        print(f"Elo difference: {estimate[0]:+.1f} +/- {estimate[1]:.1f} (95%)")
+
+
+class Args:
+    def __init__(self) -> None:
+        self.openings: str
+        self.games: int
+        self.workers: int
+        self.depth: int
+        self.movetime: float | None
+        self.nodes: int | None
+        self.b_depth: int | None
+        self.b_movetime: float | None
+        self.b_nodes: int | None
+        self.max_plies: int
+        self.output: str
+
+
+def main_tournament() -> None:
+    parser = argparse.ArgumentParser(
+        prog="tournament.py"
+    )
+    args = Args()
+    parser.add_argument("openings", help="File with one starting FEN per line.")
+    parser.add_argument("-g", "--games", type=int, default=2)
+    parser.add_argument("-w", "--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--depth", type=int, default=const.DEFAULT_SEARCH_DEPTH, help="Maximum search depth of both engines.")
+    parser.add_argument("--movetime", type=float, default=None, help="Seconds per move of both engines.")
+    parser.add_argument("--nodes", type=int, default=None, help="Nodes per move of both engines.")
+    parser.add_argument("--b-depth", type=int, default=None, help="Overrides --depth for engine B.")
+    parser.add_argument("--b-movetime", type=float, default=None, help="Overrides --movetime for engine B.")
+    parser.add_argument("--b-nodes", type=int, default=None, help="Overrides --nodes for engine B.")
+    parser.add_argument("--max-plies", type=int, default=300, help="Games longer than this are adjudicated as draws.")
+    parser.add_argument("-o", "--output", default="games.pgn")
+    parser.parse_args(namespace=args)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    try:
+        openings: list[str] = load_openings(args.openings)
+    except errors.InvalidFEN:
+        print("Invalid FEN string in the openings file.")
+        sys.exit(1)
+
+    player_a = PlayerLimits("A", args.depth, args.movetime, args.nodes)
+    player_b = PlayerLimits(
+        "B",
+        args.b_depth if args.b_depth is not None else args.depth,
+        args.b_movetime if args.b_movetime is not None else args.movetime,
+        args.b_nodes if args.b_nodes is not None else args.nodes
+    )
+    run_tournament(openings, args.games, args.workers, player_a, player_b, args.max_plies, args.output)
+
+
+if __name__ == "__main__":
+    main_tournament()
@@ -0,0 +1,297 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import constants as const
+from board import Board
+from pgn import read_games, play_sans
+import errors
+import fen
+
+
+# Notation of the piece on every plane, white pieces first, in the order Pawn, Knight, Bishop, Rook, Queen, King.
+PLANE_PIECES: str = "".join(
+    const.symbol_notation_and_material[const.NOTATION][color][name]
+    for color in [const.WHITE, const.BLACK]
+    for name in [const.PAWN, const.KNIGHT, const.BISHOP, const.ROOK, const.QUEEN, const.KING]
+)
+OUTCOMES: dict[str, int] = {"1-0": 1, "0-1": -1, "1/2-1/2": 0, "*": 0}
+
+# Arrays of one chunk: (name, dtype, shape of one position).
+ARRAYS: list[tuple[str, str, tuple[int, ...]]] = [
+    ("planes", "uint8", (len(PLANE_PIECES), const.GRID_SIZE, const.GRID_SIZE)),
+    ("side_to_move", "uint8", ()),
+    ("castling", "uint8", (len(const.CASTLING_SIDES),)),
+    ("outcome", "int8", ()),
+]
+
+# (squares, active color, castling, outcome) where squares holds the notation of all 64 squares like PackedBoard
+# and castling is four 0s and 1s in the order of CASTLING_SIDES.
+Position = tuple[str, int, str, int]
+# Task sent to a worker: ("games", [(starting FEN, moves in SAN, result)]) or ("fens", [FEN line]).
+Task = tuple[str, list[Any]]
+
+
+
+class ChunkWriter:
+    """
+    Writes encoded positions into fixed-size chunks of .npy files, preallocated and filled through np.memmap.
+
+    Chunk i is made of chunk_<i>_planes.npy, chunk_<i>_side_to_move.npy, chunk_<i>_castling.npy and
+    chunk_<i>_outcome.npy. The last chunk is cut to the number of positions written to it, and manifest.json lists
+    every chunk with its number of positions, along with the counts of truncated games and skipped inputs.
+
+    Args:
+        directory: Directory the chunks are written to, created if it does not exist.
+        chunk_size: Number of positions per chunk.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = const.TRAINING_CHUNK_SIZE) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory: str = directory
+        self.chunk_size: int = chunk_size
+        self.chunks: list[dict[str, Any]] = []
+        self.arrays: dict[str, Any] = {}
+        self.filled: int = 0
+        self.total: int = 0
+        self.truncated_games: int = 0
+        self.skipped_inputs: int = 0
+
+
+    def path(self, chunk_index: int, name: str) -> str:
+        return os.path.join(self.directory, f"chunk_{chunk_index:05}_{name}.npy")
+
+
+    def open_chunk(self) -> None:
+        chunk_index: int = len(self.chunks)
+        self.arrays = {
+            name: np.lib.format.open_memmap(self.path(chunk_index, name), mode="w+", dtype=dtype, shape=(self.chunk_size, *shape))
+            for name, dtype, shape in ARRAYS
+        }
+        self.chunks.append({"index": chunk_index, "positions": 0})
+        self.filled = 0
+
+
+    def write(self, encoded: dict[str, Any]) -> None:
+        """Copies a batch of encoded positions, as returned by encode_positions, into the chunks."""
+
+        count: int = len(encoded["outcome"])
+        start: int = 0
+        while start < count:
+            if not self.arrays or self.filled == self.chunk_size:
+                self.close_chunk()
+                self.open_chunk()
+            end: int = min(count, start + self.chunk_size - self.filled)
+            for name, array in self.arrays.items():
+                array[self.filled:self.filled + end - start] = encoded[name][start:end]
+            self.filled += end - start
+            self.total += end - start
+            self.chunks[-1]["positions"] = self.filled
+            start = end
+
+
+    def close_chunk(self) -> None:
+        """Flushes the open chunk to disk, cutting it to the positions written if it is not full."""
+
+        if not self.arrays:
+            return
+        chunk_index: int = len(self.chunks) - 1
+        for array in self.arrays.values():
+            array.flush()
+        if self.filled < self.chunk_size:
+            # Copied before the files are rewritten, as the memmaps still point into them.
+            written: dict[str, Any] = {name: np.array(array[:self.filled]) for name, array in self.arrays.items()}
+            self.arrays = {}
+            for name, array in written.items():
+                np.save(self.path(chunk_index, name), array)
+        self.arrays = {}
+
+
+    def close(self) -> None:
+        self.close_chunk()
+        manifest: dict[str, Any] = {
+            "chunk_size": self.chunk_size,
+            "positions": self.total,
+            "truncated_games": self.truncated_games,
+            "skipped_inputs": self.skipped_inputs,
+            "plane_pieces": PLANE_PIECES,
+            "castling_sides": const.CASTLING_SIDES,
+            "chunks": self.chunks,
+        }
+        with open(os.path.join(self.directory, "manifest.json"), "w") as file:
+            json.dump(manifest, file, indent=2)
+
+
+def encode_positions(positions: list[Position]) -> dict[str, Any]:
+    """
+    Encodes positions into arrays, with every position encoded at once per array instead of square by square.
+
+    Returns:
+        encoded: Dictionary of
+            planes: (n, 12, 8, 8) uint8, 1 where the piece of the plane (see PLANE_PIECES) stands, rank 8 first.
+            side_to_move: (n,) uint8, WHITE or BLACK.
+            castling: (n, 4) uint8, availability of the sides in CASTLING_SIDES.
+            outcome: (n,) int8, 1 if White won, -1 if Black won and 0 for draws and unknown results.
+    """
+    squares = np.frombuffer("".join(position[0] for position in positions).encode("ascii"), dtype=np.uint8)
+    pieces = np.frombuffer(PLANE_PIECES.encode("ascii"), dtype=np.uint8)
+    planes = squares.reshape(len(positions), 1, const.GRID_SIZE * const.GRID_SIZE) == pieces.reshape(1, len(PLANE_PIECES), 1)
+    castling = np.frombuffer("".join(position[2] for position in positions).encode("ascii"), dtype=np.uint8) - ord("0")
+
+    return {
+        "planes": planes.view(np.uint8).reshape(len(positions), len(PLANE_PIECES), const.GRID_SIZE, const.GRID_SIZE),
+        "side_to_move": np.fromiter((position[1] for position in positions), dtype=np.uint8, count=len(positions)),
+        "castling": castling.reshape(len(positions), len(const.CASTLING_SIDES)),
+        "outcome": np.fromiter((position[3] for position in positions), dtype=np.int8, count=len(positions)),
+    }
+
+
+def game_positions(starting_fen: str, sans: list[str], result: str) -> list[Position]:
+    """
+    Returns every position of the game before each move, raising InvalidFEN if the starting FEN is not valid.
+
+    The game is cut before its first move which is not legal or not supported by Board, so fewer positions than
+    moves are returned for a truncated game.
+    """
+    board = Board(starting_fen)
+    outcome: int = OUTCOMES.get(result, 0)
+    positions: list[Position] = []
+    for _ in play_sans(board, sans):
+        squares, active_color, castling, *_ = board.pack()
+        positions.append((squares, active_color, castling, outcome))
+    return positions
+
+
+def fen_position(line: str) -> Position:
+    """
+    Returns the position of a FEN line, raising InvalidFEN if it is not valid.
+
+    The FEN may be followed by the result of the game, e.g. '... w KQkq - 0 1 1-0'.
+    """
+    fields: list[str] = line.split()
+    result: str = fields.pop() if len(fields) == const.NUMBER_OF_FEN_COMPONENTS + 1 else "*"
+    FEN_data: dict[str, Any] | None = fen.fen_parser(" ".join(fields))
+    if not FEN_data or not fen.has_one_king_per_color(FEN_data):
+        raise errors.InvalidFEN
+    return (
+        "".join(FEN_data["piece_placement_data"]),
+        FEN_data["active_color"],
+        "".join(FEN_data["castling_availability"]),
+        OUTCOMES.get(result, 0)
+    )
+
+
+def encode_task(task: Task) -> tuple[dict[str, Any] | None, int, int]:
+    """
+    Encodes the positions of a task in a worker process.
+
+    Returns:
+        result: Tuple of (encoded positions or None, truncated games, skipped inputs).
+    """
+    kind, items = task
+    positions: list[Position] = []
+    truncated: int = 0
+    skipped: int = 0
+    for item in items:
+        try:
+            if kind == "games":
+                game: list[Position] = game_positions(*item)
+                truncated += len(game) < len(item[1])
+                positions.extend(game)
+            else:
+                positions.append(fen_position(item))
+        except errors.CustomException:
+            skipped += 1
+    return (encode_positions(positions) if positions else None), truncated, skipped
+
+
+def read_tasks(paths: list[str]) -> Iterator[Task]:
+    """Streams the games of .pgn files and the lines of FEN files, grouped into tasks."""
+
+    for path in paths:
+        with open(path) as file:
+            if path.endswith(".pgn"):
+                games: Iterable[Any] = (
+                    (headers.get("FEN", const.DEFAULT_FEN), sans, result) for headers, sans, result in read_games(file)
+                )
+                yield from batched("games", games, const.TRAINING_GAMES_PER_TASK)
+            else:
+                lines: Iterable[str] = (line.strip() for line in file if line.strip() and not line.startswith("#"))
+                yield from batched("fens", lines, const.TRAINING_FENS_PER_TASK)
+
+
+def batched(kind: str, items: Iterable[Any], size: int) -> Iterator[Task]:
+    batch: list[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield kind, batch
+            batch = []
+    if batch:
+        yield kind, batch
+
+
+def export(paths: list[str], directory: str, workers: int, chunk_size: int = const.TRAINING_CHUNK_SIZE) -> ChunkWriter:
+    """
+    Encodes every position of the input files across a process pool and writes them into chunks in directory.
+
+    Tasks are read lazily and results are written as they arrive, in input order, so memory use does not grow with
+    the size of the input.
+
+    Returns:
+        writer: The closed ChunkWriter, with the counts of positions written, truncated games and skipped inputs.
+    """
+    writer = ChunkWriter(directory, chunk_size)
+    with multiprocessing.Pool(workers) as pool:
+        for encoded, truncated, skipped in pool.imap(encode_task, read_tasks(paths)):
+            writer.truncated_games += truncated
+            writer.skipped_inputs += skipped
+            if encoded is not None:
+                writer.write(encoded)
+    writer.close()
+    return writer
+
+
+class Args:
+    def __init__(self) -> None:
+        self.inputs: list[str]
+        self.output: str
+        self.workers: int
+        self.chunk_size: int
+
+
+def main_training_data() -> None:
+    parser = argparse.ArgumentParser(
+        prog="training_data.py"
+    )
+    args = Args()
+    parser.add_argument("inputs", nargs="+", help=".pgn files, or files with one FEN per line optionally followed by the result.")
+    parser.add_argument("-o", "--output", default="training_data", help="Directory the chunks are written to.")
+    parser.add_argument("-w", "--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=const.TRAINING_CHUNK_SIZE, help="Positions per chunk.")
+    parser.parse_args(namespace=args)
+
+    if np is None:
+        print("The training data exporter needs numpy, install it with 'pip install numpy'.")
+        sys.exit(1)
+
+    start: float = time.perf_counter()
+    writer: ChunkWriter = export(args.inputs, args.output, args.workers, args.chunk_size)
+    elapsed: float = time.perf_counter() - start
+    print(
+        f"Wrote {writer.total} positions to {args.output} in {elapsed:.1f}s ({writer.total / elapsed:.0f} positions/s), "
+        f"{writer.truncated_games} games cut at an unsupported or illegal move, skipped {writer.skipped_inputs} unreadable inputs."
+    )
+
+
+if __name__ == "__main__":
+    main_training_data()
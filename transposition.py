@@ -0,0 +1,98 @@
+import struct
+from multiprocessing import shared_memory
+
+import constants as const
+from positions import MovementTuple
+from board import square_positions
+
+
+
+class TranspositionTable:
+    """
+    Fixed size hash table of search results, stored in a flat buffer so it can live in shared memory.
+
+    Every entry is 16 bytes, (key ^ data, data), where data packs the score, depth, bound flag and best move. Entries
+    are written without a lock: a reader recomputes key from both words, so an entry torn by two processes writing at
+    once does not match any position and is treated as a miss.
+
+    Args:
+        buffer: Writable buffer holding the entries, e.g. a bytearray or SharedMemory.buf.
+    """
+
+    entry = struct.Struct("<QQ")
+
+    def __init__(self, buffer: memoryview | bytearray) -> None:
+        self.buffer: memoryview | bytearray = buffer
+        self.size: int = len(buffer) // TranspositionTable.entry.size
+        self.hits: int = 0
+        self.probes: int = 0
+
+
+    @classmethod
+    def create(cls, size_mb: int = const.TT_DEFAULT_SIZE_MB) -> "TranspositionTable":
+        """Creates a table private to this process."""
+
+        return cls(bytearray(size_mb * 1024 * 1024))
+
+
+    @classmethod
+    def create_shared(cls, size_mb: int = const.TT_DEFAULT_SIZE_MB) -> tuple["TranspositionTable", shared_memory.SharedMemory]:
+        """Creates a table in shared memory, other processes attach to it with attach_shared(shared_memory.name)."""
+
+        memory = shared_memory.SharedMemory(create=True, size=size_mb * 1024 * 1024)
+        memory.buf[:] = bytes(memory.size)
+        return cls(memory.buf), memory
+
+
+    @classmethod
+    def attach_shared(cls, name: str) -> tuple["TranspositionTable", shared_memory.SharedMemory]:
+        memory = shared_memory.SharedMemory(name=name)
+        return cls(memory.buf), memory
+
+
+    def probe(self, key: int) -> tuple[int, int, int, MovementTuple | None] | None:
+        """Returns (depth, flag, score, best move) stored for the position hash key, or None."""
+
+        self.probes += 1
+        stored_key, data = TranspositionTable.entry.unpack_from(self.buffer, (key % self.size) * TranspositionTable.entry.size)
+        if stored_key ^ data != key or not data:
+            return None
+        self.hits += 1
+
+        score: int = (data & 0xFFFFFFFF) - (1 << 31)
+        depth: int = (data >> 32) & 0xFF
+        flag: int = (data >> 40) & 0x3
+        move_code: int = (data >> 42) & 0x1FFF
+        return depth, flag, score, decode_move(move_code)
+
+
+    def store(self, key: int, depth: int, flag: int, score: int, best_move: MovementTuple | None) -> None:
+        """Stores a search result, replacing the entry unless it holds a deeper result for the same position."""
+
+        offset: int = (key % self.size) * TranspositionTable.entry.size
+        stored_key, stored_data = TranspositionTable.entry.unpack_from(self.buffer, offset)
+        if stored_key ^ stored_data == key and ((stored_data >> 32) & 0xFF) > depth:
+            return
+
+        data: int = (score + (1 << 31)) | (min(depth, 0xFF) << 32) | (flag << 40) | (encode_move(best_move) << 42)
+        TranspositionTable.entry.pack_into(self.buffer, offset, key ^ data, data)
+
+
+def encode_move(movement: MovementTuple | None) -> int:
+    """Packs a move into 13 bits, 0 for no move."""
+
+    if movement is None:
+        return 0
+    initial: int = movement.initial_position.rank * const.GRID_SIZE + movement.initial_position.file
+    final: int = movement.final_position.rank * const.GRID_SIZE + movement.final_position.file
+    return 1 << 12 | initial << 6 | final
+
+
+def decode_move(move_code: int) -> MovementTuple | None:
+    if not move_code:
+        return None
+    initial, final = (move_code >> 6) & 0x3F, move_code & 0x3F
+    return MovementTuple((
+        square_positions[initial // const.GRID_SIZE][initial % const.GRID_SIZE],
+        square_positions[final // const.GRID_SIZE][final % const.GRID_SIZE]
+    ))
@@ -0,0 +1,27 @@
+import random
+
+import constants as const
+
+
+
+# Fixed seed, so the same position gets the same hash in every process and run.
+generator = random.Random(const.ZOBRIST_SEED)
+
+# Random 64 bit keys, piece_keys[(color, name)][rank * GRID_SIZE + file] for every piece on every square.
+piece_keys: dict[tuple[int, str], list[int]] = {
+    (color, name): [generator.getrandbits(64) for _ in range(const.GRID_SIZE * const.GRID_SIZE)]
+    for color in [const.WHITE, const.BLACK]
+    for name in [const.KING, const.QUEEN, const.ROOK, const.BISHOP, const.KNIGHT, const.PAWN]
+}
+black_to_move_key: int = generator.getrandbits(64)
+castling_keys: dict[str, int] = {
+    const.symbol_notation_and_material[const.NOTATION][color][side]: generator.getrandbits(64)
+    for color in [const.WHITE, const.BLACK]
+    for side in [const.KING, const.QUEEN]
+}
+
+
+def piece_key(color: int, name: str, rank: int, file: int) -> int:
+    """Returns the key of a piece of the given color and name standing on (rank, file)."""
+
+    return piece_keys[(color, name)][rank * const.GRID_SIZE + file]